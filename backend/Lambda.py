@@ -1,47 +1,229 @@
-import json, os, boto3, jwt
+import json, os, re, time, hashlib, hmac, logging
+from urllib.parse import quote
+
+# orjson isn't vendored in lambda.zip; use it when the layer provides it
+try:
+    import orjson
+    _loads = orjson.loads
+    def _dumps(obj): return orjson.dumps(obj).decode()
+except ImportError:
+    _loads = json.loads
+    def _dumps(obj): return json.dumps(obj, separators=(",", ":"))
+
+log = logging.getLogger()
+log.setLevel(os.getenv('LOG_LEVEL', 'WARNING'))
+
+# boto3/jwt are imported on first real request (see _deps / _s3_client),
+# so OPTIONS pre-flight cold starts never pay for them
+jwt = None
+_s3 = None
+
+# HS256-only verifier and prepared key, built once by _deps()
+_jws = None
+_jwt_key = None
 
-s3 = boto3.client('s3')
 JWT_SECRET  = os.environ['JWT_SECRET_KEY']
 BUCKET_NAME = os.environ['BUCKET_NAME']
+REGION      = os.environ.get('AWS_REGION', 'ap-southeast-2')
+URL_EXPIRES = 300
+MAX_BODY    = 4096   # {"filename": ...} never needs more
+
+# Virtual-hosted S3 endpoint; fixed for the container's lifetime
+_HOST       = f"{BUCKET_NAME}.s3.{REGION}.amazonaws.com"
+_URL_PREFIX = f"https://{_HOST}"
+
+# Upload names become "<user>/<filename>" keys: single path segment, bounded length.
+# Spaces/parentheses are allowed because the frontend sends File.name verbatim
+_FN_RE = re.compile(r'(?!\.{1,2}\Z)[A-Za-z0-9 ._()+-]{1,255}')   # used with fullmatch
 
+# Shared by every response dict; treat as read-only
 CORS = {
     "Access-Control-Allow-Origin": "*",
     "Access-Control-Allow-Headers": "Content-Type,Authorization",
     "Access-Control-Allow-Methods": "OPTIONS,POST"
 }
 
-def ok(body):  return {"statusCode": 200, "headers": CORS, "body": json.dumps(body)}
-def err(code,msg): return {"statusCode": code, "headers": CORS, "body": json.dumps({"error": msg})}
+# Verified JWT payloads, keyed by sha256(token); lives across warm invocations
+JWT_CACHE_TTL  = 30
+JWT_CACHE_SIZE = 1024
+_jwt_cache = {}   # key -> (cached_at, payload)
+
+# Recently issued upload URLs, so client retries of the same file skip re-signing.
+# Off by default; a cached URL is at most URL_CACHE_TTL old, well inside URL_EXPIRES
+URL_CACHE      = os.environ.get('PRESIGN_CACHE', '') == '1'
+URL_CACHE_TTL  = 60
+URL_CACHE_SIZE = 2048
+_url_cache = {}   # (user, filename) -> (cached_at, url)
+
+def ok(body):  return {"statusCode": 200, "headers": CORS, "body": _dumps(body)}
+def err(code,msg): return {"statusCode": code, "headers": CORS, "body": _dumps({"error": msg})}
+
+# Fixed responses, serialized once and returned by reference
+_PREFLIGHT        = {"statusCode": 200, "headers": CORS}
+_ERR_401          = err(401, "invalid token")
+_ERR_NO_FILENAME  = err(400, "missing filename")
+_ERR_BAD_FILENAME = err(400, "bad filename")
+_ERR_TOO_LARGE    = err(413, "body too large")
+
+def _deps():
+    """Import PyJWT on first use and build the HS256 verifier"""
+    global jwt, _jws, _jwt_key
+    if jwt is None:
+        import jwt as _jwt
+        from jwt.algorithms import HMACAlgorithm
+        jwt = _jwt
+        _jws = jwt.PyJWS(algorithms=["HS256"])
+        _jwt_key = HMACAlgorithm(HMACAlgorithm.SHA256).prepare_key(JWT_SECRET)
+
+def _s3_client():
+    """Create the S3 client on first use"""
+    global _s3
+    if _s3 is None:
+        import boto3
+        from botocore.config import Config
+        # Sized for bursty concurrent uploads sharing one warm container
+        _s3 = boto3.client('s3', config=Config(max_pool_connections=50, tcp_keepalive=True,
+                                               retries={"max_attempts": 2, "mode": "standard"}))
+    return _s3
+
+def verify_token(token):
+    """Return the token's `sub`, skipping signature checks for recently verified tokens"""
+    key = hashlib.sha256(token.encode()).hexdigest()
+    now = time.time()
+    hit = _jwt_cache.get(key)
+    if hit and now - hit[0] < JWT_CACHE_TTL and hit[1]["exp"] > now:
+        return hit[1]["sub"]
+
+    # Signature check only; the two claims we rely on are checked inline below.
+    # Anything invalid raises, so failures are never cached
+    payload = _loads(_jws.decode(token, _jwt_key, algorithms=["HS256"]))
+    for claim in ("exp", "sub"):
+        if claim not in payload:
+            raise jwt.MissingRequiredClaimError(claim)
+    if not isinstance(payload["exp"], (int, float)):
+        raise jwt.DecodeError("Expiration Time claim (exp) must be an integer.")
+    if not isinstance(payload["sub"], str):
+        raise jwt.exceptions.InvalidSubjectError("Subject must be a string")
+    if payload["exp"] <= now:
+        raise jwt.ExpiredSignatureError("Signature has expired")
+    if len(_jwt_cache) >= JWT_CACHE_SIZE:
+        _jwt_cache.pop(next(iter(_jwt_cache)))   # drop the oldest entry
+    _jwt_cache[key] = (now, payload)
+    return payload["sub"]
+
+# SigV4 signing key for the current secret and UTC day: ((secret, yyyymmdd), key).
+# Keyed on the secret too, so rotated (STS/role) credentials re-derive it mid-day
+_signing_key = (None, None)
+
+def _get_signing_key(secret, datestamp):
+    global _signing_key
+    if _signing_key[0] != (secret, datestamp):
+        k = ("AWS4" + secret).encode()
+        for part in (datestamp, REGION, "s3", "aws4_request"):
+            k = hmac.new(k, part.encode(), hashlib.sha256).digest()
+        _signing_key = ((secret, datestamp), k)
+    return _signing_key[1]
+
+def presign_put(key):
+    """Build a SigV4 pre-signed PUT URL without going through botocore"""
+    access_key = os.environ.get("AWS_ACCESS_KEY_ID")
+    secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
+    if not (access_key and secret_key):
+        # No static credentials in the environment, let botocore resolve them
+        return _s3_client().generate_presigned_url(
+            "put_object",
+            Params={"Bucket": BUCKET_NAME, "Key": key},
+            ExpiresIn=URL_EXPIRES
+        )
+
+    amz_date  = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    datestamp = amz_date[:8]
+    scope     = f"{datestamp}/{REGION}/s3/aws4_request"
+    path      = "/" + quote(key, safe="/~")
+
+    params = {
+        "X-Amz-Algorithm": "AWS4-HMAC-SHA256",
+        "X-Amz-Credential": f"{access_key}/{scope}",
+        "X-Amz-Date": amz_date,
+        "X-Amz-Expires": str(URL_EXPIRES),
+        "X-Amz-SignedHeaders": "host",
+    }
+    session_token = os.environ.get("AWS_SESSION_TOKEN")
+    if session_token:
+        params["X-Amz-Security-Token"] = session_token
+    query = "&".join(f"{k}={quote(v, safe='~')}" for k, v in sorted(params.items()))
+
+    canonical = f"PUT\n{path}\n{query}\nhost:{_HOST}\n\nhost\nUNSIGNED-PAYLOAD"
+    to_sign = f"AWS4-HMAC-SHA256\n{amz_date}\n{scope}\n{hashlib.sha256(canonical.encode()).hexdigest()}"
+    signature = hmac.new(_get_signing_key(secret_key, datestamp), to_sign.encode(), hashlib.sha256).hexdigest()
+
+    return _URL_PREFIX + path + "?" + query + "&X-Amz-Signature=" + signature
+
+def presign_cached(user, filename):
+    """presign_put() for `user/filename`, reusing a recent URL when PRESIGN_CACHE=1"""
+    if not URL_CACHE:
+        return presign_put(user + "/" + filename)
+    key = (user, filename)
+    now = time.time()
+    hit = _url_cache.get(key)
+    if hit and now - hit[0] < URL_CACHE_TTL:
+        return hit[1]
+    url = presign_put(user + "/" + filename)
+    if len(_url_cache) >= URL_CACHE_SIZE:
+        _url_cache.pop(next(iter(_url_cache)))   # drop the oldest entry
+    _url_cache[key] = (now, url)
+    return url
+
+def _prime():
+    """Do presign setup during init so it is captured by warm/snapshotted containers"""
+    secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
+    if secret_key and os.environ.get("AWS_ACCESS_KEY_ID"):
+        _get_signing_key(secret_key, time.strftime("%Y%m%d", time.gmtime()))
+    else:
+        # Every request will go through botocore; resolve endpoint + signer now
+        _s3_client().meta.endpoint_url
+        from botocore.auth import S3SigV4QueryAuth  # noqa: F401
+
+_prime()
 
 def lambda_handler(event, _):
     m = event.get("requestContext", {}).get("http", {}).get("method")
-    print("METHOD =", m)
+    log.debug("METHOD = %s", m)
 
     # 1) Pre-flight check
     if m == "OPTIONS":
-        return {"statusCode": 200, "headers": CORS}
+        return _PREFLIGHT
 
     # 2) Get and verify JWT (case-insensitive)
+    _deps()
     try:
-        hdrs  = event.get("headers", {})
-        token = (hdrs.get("Authorization") or hdrs.get("authorization") or "").replace("Bearer ", "")
-        user  = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])["sub"]
+        hdrs  = event.get("headers") or {}
+        # HTTP API (payload v2) already lowercases header names; only rebuild otherwise
+        if any(k[:1].isupper() for k in hdrs):
+            hdrs = {k.lower(): v for k, v in hdrs.items()}
+        auth  = hdrs.get("authorization", "")
+        token = auth[7:] if auth.startswith("Bearer ") else auth
+        user  = verify_token(token)
     except Exception as e:
-        print("JWT failed:", e)
-        return err(401, "invalid token")
+        log.warning("JWT failed: %s", e)
+        return _ERR_401
 
     # 3) Parse JSON body
+    raw = event.get("body") or "{}"
+    if len(raw) > MAX_BODY:
+        return _ERR_TOO_LARGE
     try:
-        filename = json.loads(event.get("body","{}"))["filename"]
-    except Exception as e:
-        print("Body failed:", e)
-        return err(400, "missing filename")
+        body = _loads(raw)
+    except ValueError as e:   # json/orjson decode errors both subclass ValueError
+        log.warning("Body failed: %s", e)
+        return _ERR_NO_FILENAME
+    filename = body.get("filename") if isinstance(body, dict) else None
+    if filename is None:
+        return _ERR_NO_FILENAME
+    if not isinstance(filename, str) or not _FN_RE.fullmatch(filename):
+        return _ERR_BAD_FILENAME
 
     # 4) Generate S3 pre-signed URL
-    url = s3.generate_presigned_url(
-        "put_object",
-        Params={"Bucket": BUCKET_NAME, "Key": f"{user}/{filename}"},
-        ExpiresIn=300
-    )
+    url = presign_cached(user, filename)
 
     return ok({"url": url})
@@ -1,25 +1,39 @@
-from flask import Flask, Blueprint
-from config import Config
-from extensions import db, jwt, cors
-from routes.auth import auth_bp
-from routes.batch import batch_bp
-from routes.inspection import inspection_bp
+from flask import Flask
+import config
+from extensions import db, jwt, cors, orjson, ORJSONProvider, start_log_queue
 from flask_cors import CORS
 
 def create_app():
     app = Flask(__name__)
+    if orjson:
+        app.json = ORJSONProvider(app)
     CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
-    app.config.from_object(Config)
+    app.config.from_object(config)
 
     db.init_app(app)
     jwt.init_app(app)
     cors.init_app(app)
 
-    # Register routes
+    # Register routes (imported here so importing app stays cheap)
+    from routes.auth import auth_bp
+    from routes.batch import batch_bp
+    from routes.inspection import inspection_bp
+
     app.register_blueprint(auth_bp, url_prefix="/auth")
     app.register_blueprint(batch_bp, url_prefix="/batches")
     app.register_blueprint(inspection_bp, url_prefix="")
 
+    # After the route modules' logging.basicConfig(), so their handler gets queued
+    if app.config.get("LOG_QUEUE"):
+        start_log_queue()
+
+    @app.get("/health")
+    def health():
+        # Pool status (checked-out/overflow connections) goes to the log, not the
+        # unauthenticated response
+        app.logger.info("DB pool: %s", db.engine.pool.status())
+        return {"status": "ok"}
+
     return app
 
 if __name__ == "__main__":
@@ -0,0 +1,32 @@
+"""
+Optional: compile the batch routes and BatchService with Cython, in place.
+
+    pip install Cython && python build_ext.py build_ext --inplace
+
+This writes routes/batch.*.so and services/batch_service.*.so next to their .py
+files. Python imports an extension ahead of the .py, so the handlers and the
+metadata validation run compiled. Without Cython or a C compiler it prints a
+notice and exits, and the app keeps using the plain .py files.
+Delete the .so files (and the generated .c) to go back to pure Python.
+"""
+import sys
+
+try:
+    from Cython.Build import cythonize
+    from setuptools import setup
+except ImportError:
+    print("Cython/setuptools not installed; routes run as plain Python")
+    sys.exit(0)
+
+try:
+    setup(
+        name="backend-ext",
+        ext_modules=cythonize(["routes/batch.py", "services/batch_service.py"],
+                              compiler_directives={"language_level": 3}),
+        script_args=sys.argv[1:] or ["build_ext", "--inplace"],
+    )
+except SystemExit as e:
+    # setup() exits non-zero when the C compiler is missing or fails
+    if e.code:
+        print("Cython build failed; routes run as plain Python")
+    sys.exit(0)
@@ -1,32 +1,72 @@
 import os
-from dotenv import load_dotenv
 from datetime import timedelta
+from sqlalchemy.pool import NullPool
 
-class Config:
-    # Flask
-    SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key')
-    
-    # Database - Use sqlite for testing, migrate to other DB later
-    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///sqlite_test.db')
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
-    
-    # JWT - Set in .env file if not provided
-    JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', '6452-jwt-secret-key')
-    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=30)
-    
-    # CORS configuration - Allow frontend cross-origin access
-    CORS_ORIGINS = ['http://localhost:5173', 'http://127.0.0.1:5173']
-    CORS_ALLOW_HEADERS = ['Content-Type', 'Authorization']
-    CORS_METHODS = ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS']
-    
-    # Using lambda now, backend doesn't generate presigned URLs, frontend calls lambda directly
-    # # AWS (placeholder values)
-    # AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID', 'dummy-access-key')
-    # AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY', 'dummy-secret-key')
-    # AWS_REGION = os.getenv('AWS_REGION', 'ap-southeast-2')
-    # AWS_BUCKET_NAME = os.getenv('AWS_BUCKET_NAME', 'dummy-bucket')
-
-
-# Pure configuration class Config, all fields use .env environment variables as fallback, 
+# Flask
+SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key')
+
+# Database - Use sqlite for testing, migrate to other DB later
+SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///sqlite_test.db')
+SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+# Connection pool sized for concurrent auth traffic on a server database (per worker
+# process; override with DB_POOL_SIZE / DB_MAX_OVERFLOW). SQLite keeps SQLAlchemy's
+# defaults: one writer at a time, and a local file never goes stale.
+# DB_EXTERNAL_POOL=1 (e.g. behind PgBouncer): the external pooler keeps the server
+# connections warm, so each worker opens cheap pooler connections per use (NullPool)
+if SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+elif os.getenv('DB_EXTERNAL_POOL', '0') == '1':
+    SQLALCHEMY_ENGINE_OPTIONS = {'poolclass': NullPool}
+else:
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '20')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '40')),
+        'pool_pre_ping': True,   # drop connections the server closed while idle
+        'pool_recycle': 300,
+    }
+
+# create_batch: 1 = answer 202 right after the tx is sent and confirm it in the
+# background; 0 (default) = wait for the receipt and answer 201
+ASYNC_TX_CONFIRM = os.getenv('ASYNC_TX_CONFIRM', '0') == '1'
+
+# 1 (default) = count transaction nonces in-process after one eth_getTransactionCount.
+# Only safe while one process sends (python app.py, or a single gunicorn worker);
+# set 0 with several workers so each send re-reads the node's pending count
+NONCE_CACHE = os.getenv('NONCE_CACHE', '1') == '1'
+
+# Slash dates from the frontend: 1 (default) = DD/MM/YYYY, 0 = MM/DD/YYYY
+DATE_SLASH_DAY_FIRST = os.getenv('DATE_SLASH_DAY_FIRST', '1') == '1'
+
+# 1 = log records are written by a background thread (QueueHandler), not the request thread
+LOG_QUEUE = os.getenv('LOG_QUEUE', '0') == '1'
+
+# GET /batches and /batches/<id> carry an ETag; seconds clients may reuse a response
+# without revalidating (0 = always revalidate, answered with 304 if unchanged)
+READ_CACHE_MAX_AGE = int(os.getenv('READ_CACHE_MAX_AGE', '0'))
+
+# GET /batches: largest per_page served; larger requests are clamped to it.
+# Pages above 100 are streamed (routes.batch.STREAM_MIN_BATCHES), so only if this is raised
+MAX_PER_PAGE = int(os.getenv('MAX_PER_PAGE', '100'))
+
+# JWT - Set in .env file if not provided
+JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', '6452-jwt-secret-key')
+JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=30)
+
+# CORS configuration - Allow frontend cross-origin access
+CORS_ORIGINS = ['http://localhost:5173', 'http://127.0.0.1:5173']
+CORS_ALLOW_HEADERS = ['Content-Type', 'Authorization']
+CORS_METHODS = ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS']
+
+# Using lambda now, backend doesn't generate presigned URLs, frontend calls lambda directly
+# # AWS (placeholder values)
+# AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID', 'dummy-access-key')
+# AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY', 'dummy-secret-key')
+# AWS_REGION = os.getenv('AWS_REGION', 'ap-southeast-2')
+# AWS_BUCKET_NAME = os.getenv('AWS_BUCKET_NAME', 'dummy-bucket')
+
+
+# Pure configuration module, loaded via app.config.from_object(config);
+# all fields use .env environment variables as fallback,
 # default values are placeholders (dev-secret-key, dummy-bucket, etc.).
 # Works normally, but production environment needs real values.
\ No newline at end of file
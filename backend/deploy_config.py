@@ -4,33 +4,58 @@ Contract deployment configuration file
 Used to store contract addresses, ABIs, and network configurations
 """
 
+import functools
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+
+from eth_utils import collapse_if_tuple, event_abi_to_log_topic, function_abi_to_4byte_selector
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Network configuration
-NETWORKS = {
+_RAW_NETWORKS = {
     'development': {
         'name': 'Development Network',
         'rpc_url': 'http://127.0.0.1:8545',  # Ganache default address
+        'ws_url': 'ws://127.0.0.1:8545',     # Ganache serves WebSocket on the same port
         'chain_id': 1337,
         'gas_limit': 6721975,
-        'gas_price': 20000000000,  # 20 Gwei
+        'gas_price': 20000000000,  # 20 Gwei, legacy fallback for nodes without EIP-1559
+        'fee_strategy': {'type': 'eip1559', 'priority_fee_gwei': 1, 'base_fee_multiplier': 2.0, 'cache_ttl_blocks': 1},
+        'poll': {'initial_ms': 200, 'max_ms': 15000, 'factor': 1.6, 'receipt_timeout_ms': 120000},
     },
     'testnet': {
         'name': 'Ethereum Testnet (Sepolia)',
         'rpc_url': 'https://sepolia.drpc.org',  # Sepolia testnet RPC address
+        'ws_url': 'wss://sepolia.drpc.org',
         'chain_id': 11155111,
         'gas_limit': 3000000,
         'gas_price': 20000000000,
+        'fee_strategy': {'type': 'eip1559', 'priority_fee_gwei': 1.5, 'base_fee_multiplier': 2.0, 'cache_ttl_blocks': 1},
+        'poll': {'initial_ms': 3000, 'max_ms': 15000, 'factor': 1.6, 'receipt_timeout_ms': 120000},
     },
     'mainnet': {
         'name': 'Ethereum Mainnet',
         'rpc_url': 'https://mainnet.infura.io/v3/YOUR_PROJECT_ID',
+        'ws_url': 'wss://mainnet.infura.io/ws/v3/YOUR_PROJECT_ID',
         'chain_id': 1,
         'gas_limit': 3000000,
         'gas_price': 20000000000,
+        'fee_strategy': {'type': 'eip1559', 'priority_fee_gwei': 1.5, 'base_fee_multiplier': 2.0, 'cache_ttl_blocks': 1},
+        'poll': {'initial_ms': 3000, 'max_ms': 15000, 'factor': 1.6, 'receipt_timeout_ms': 120000},
     }
 }
 
 # Contract address configuration (needs to be updated after deployment)
-CONTRACT_ADDRESSES = {
+_RAW_CONTRACT_ADDRESSES = {
     'development': {
         'BatchRegistry': '0x0d79A6bcEceC353339CC5a3E577B0B56a4AA973f',
         'InspectionManager': '0xD5D27407c79d39D1bb0a6154B3BAd147A6df7640',
@@ -45,1124 +70,160 @@ CONTRACT_ADDRESSES = {
     }
 }
 
-# BatchRegistry contract ABI (obtained from Remix)
-BATCH_REGISTRY_ABI = [
-    {
-        "inputs": [
-            {
-                "internalType": "address",
-                "name": "inspector",
-                "type": "address"
-            }
-        ],
-        "name": "authorizeInspector",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function"
-    },
-    {
-        "inputs": [],
-        "stateMutability": "nonpayable",
-        "type": "constructor"
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "uint256",
-                "name": "batchId",
-                "type": "uint256"
-            },
-            {
-                "indexed": False,
-                "internalType": "string",
-                "name": "batchNumber",
-                "type": "string"
-            },
-            {
-                "indexed": False,
-                "internalType": "string",
-                "name": "productName",
-                "type": "string"
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "owner",
-                "type": "address"
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "timestamp",
-                "type": "uint256"
-            }
-        ],
-        "name": "BatchCreated",
-        "type": "event"
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "uint256",
-                "name": "batchId",
-                "type": "uint256"
-            },
-            {
-                "indexed": False,
-                "internalType": "enum BatchRegistry.BatchStatus",
-                "name": "oldStatus",
-                "type": "uint8"
-            },
-            {
-                "indexed": False,
-                "internalType": "enum BatchRegistry.BatchStatus",
-                "name": "newStatus",
-                "type": "uint8"
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "updatedBy",
-                "type": "address"
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "timestamp",
-                "type": "uint256"
-            }
-        ],
-        "name": "BatchStatusUpdated",
-        "type": "event"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "string",
-                "name": "_batchNumber",
-                "type": "string"
-            },
-            {
-                "internalType": "string",
-                "name": "_productName",
-                "type": "string"
-            },
-            {
-                "internalType": "string",
-                "name": "_origin",
-                "type": "string"
-            },
-            {
-                "internalType": "uint256",
-                "name": "_quantity",
-                "type": "uint256"
-            },
-            {
-                "internalType": "string",
-                "name": "_unit",
-                "type": "string"
-            },
-            {
-                "internalType": "uint256",
-                "name": "_harvestDate",
-                "type": "uint256"
-            },
-            {
-                "internalType": "uint256",
-                "name": "_expiryDate",
-                "type": "uint256"
-            }
-        ],
-        "name": "createBatch",
-        "outputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "stateMutability": "nonpayable",
-        "type": "function"
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "inspector",
-                "type": "address"
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "authorizedBy",
-                "type": "address"
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "timestamp",
-                "type": "uint256"
-            }
-        ],
-        "name": "InspectorAuthorized",
-        "type": "event"
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "inspector",
-                "type": "address"
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "revokedBy",
-                "type": "address"
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "timestamp",
-                "type": "uint256"
-            }
-        ],
-        "name": "InspectorRevoked",
-        "type": "event"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "address",
-                "name": "inspector",
-                "type": "address"
-            }
-        ],
-        "name": "revokeInspector",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "uint256",
-                "name": "batchId",
-                "type": "uint256"
-            },
-            {
-                "internalType": "enum BatchRegistry.BatchStatus",
-                "name": "newStatus",
-                "type": "uint8"
-            }
-        ],
-        "name": "updateBatchStatus",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "address",
-                "name": "",
-                "type": "address"
-            }
-        ],
-        "name": "authorizedInspectors",
-        "outputs": [
-            {
-                "internalType": "bool",
-                "name": "",
-                "type": "bool"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "name": "batches",
-        "outputs": [
-            {
-                "internalType": "uint256",
-                "name": "id",
-                "type": "uint256"
-            },
-            {
-                "internalType": "string",
-                "name": "batchNumber",
-                "type": "string"
-            },
-            {
-                "internalType": "string",
-                "name": "productName",
-                "type": "string"
-            },
-            {
-                "internalType": "string",
-                "name": "origin",
-                "type": "string"
-            },
-            {
-                "internalType": "uint256",
-                "name": "quantity",
-                "type": "uint256"
-            },
-            {
-                "internalType": "string",
-                "name": "unit",
-                "type": "string"
-            },
-            {
-                "internalType": "uint256",
-                "name": "harvestDate",
-                "type": "uint256"
-            },
-            {
-                "internalType": "uint256",
-                "name": "expiryDate",
-                "type": "uint256"
-            },
-            {
-                "internalType": "enum BatchRegistry.BatchStatus",
-                "name": "status",
-                "type": "uint8"
-            },
-            {
-                "internalType": "address",
-                "name": "owner",
-                "type": "address"
-            },
-            {
-                "internalType": "uint256",
-                "name": "timestamp",
-                "type": "uint256"
-            },
-            {
-                "internalType": "bool",
-                "name": "exists",
-                "type": "bool"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "uint256",
-                "name": "batchId",
-                "type": "uint256"
-            }
-        ],
-        "name": "getBatch",
-        "outputs": [
-            {
-                "components": [
-                    {
-                        "internalType": "uint256",
-                        "name": "id",
-                        "type": "uint256"
-                    },
-                    {
-                        "internalType": "string",
-                        "name": "batchNumber",
-                        "type": "string"
-                    },
-                    {
-                        "internalType": "string",
-                        "name": "productName",
-                        "type": "string"
-                    },
-                    {
-                        "internalType": "string",
-                        "name": "origin",
-                        "type": "string"
-                    },
-                    {
-                        "internalType": "uint256",
-                        "name": "quantity",
-                        "type": "uint256"
-                    },
-                    {
-                        "internalType": "string",
-                        "name": "unit",
-                        "type": "string"
-                    },
-                    {
-                        "internalType": "uint256",
-                        "name": "harvestDate",
-                        "type": "uint256"
-                    },
-                    {
-                        "internalType": "uint256",
-                        "name": "expiryDate",
-                        "type": "uint256"
-                    },
-                    {
-                        "internalType": "enum BatchRegistry.BatchStatus",
-                        "name": "status",
-                        "type": "uint8"
-                    },
-                    {
-                        "internalType": "address",
-                        "name": "owner",
-                        "type": "address"
-                    },
-                    {
-                        "internalType": "uint256",
-                        "name": "timestamp",
-                        "type": "uint256"
-                    },
-                    {
-                        "internalType": "bool",
-                        "name": "exists",
-                        "type": "bool"
-                    }
-                ],
-                "internalType": "struct BatchRegistry.Batch",
-                "name": "",
-                "type": "tuple"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [],
-        "name": "getTotalBatches",
-        "outputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "address",
-                "name": "user",
-                "type": "address"
-            }
-        ],
-        "name": "getUserBatches",
-        "outputs": [
-            {
-                "internalType": "uint256[]",
-                "name": "",
-                "type": "uint256[]"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "address",
-                "name": "inspector",
-                "type": "address"
-            }
-        ],
-        "name": "isAuthorizedInspector",
-        "outputs": [
-            {
-                "internalType": "bool",
-                "name": "",
-                "type": "bool"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "enum BatchRegistry.BatchStatus",
-                "name": "current",
-                "type": "uint8"
-            },
-            {
-                "internalType": "enum BatchRegistry.BatchStatus",
-                "name": "next",
-                "type": "uint8"
-            }
-        ],
-        "name": "isValidStatusTransition",
-        "outputs": [
-            {
-                "internalType": "bool",
-                "name": "",
-                "type": "bool"
-            }
-        ],
-        "stateMutability": "pure",
-        "type": "function"
-    },
-    {
-        "inputs": [],
-        "name": "nextBatchId",
-        "outputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [],
-        "name": "owner",
-        "outputs": [
-            {
-                "internalType": "address",
-                "name": "",
-                "type": "address"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [],
-        "name": "totalBatches",
-        "outputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "address",
-                "name": "",
-                "type": "address"
-            },
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "name": "userBatches",
-        "outputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    }
-]
+# Transport for view-heavy reads (get_read_provider): remote networks keep one
+# persistent WebSocket instead of HTTPS requests; local Ganache stays on HTTP
+TRANSPORT_HINT = {
+    'development': 'http',
+    'testnet': 'ws',
+    'mainnet': 'ws',
+}
 
-# InspectionManager contract ABI (obtained from Remix)
-INSPECTION_MANAGER_ABI = [
-    {
-        "inputs": [
-            {
-                "internalType": "address",
-                "name": "_batchRegistryAddress",
-                "type": "address"
-            }
-        ],
-        "stateMutability": "nonpayable",
-        "type": "constructor"
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "uint256",
-                "name": "batchId",
-                "type": "uint256"
-            },
-            {
-                "indexed": False,
-                "internalType": "enum BatchRegistry.BatchStatus",
-                "name": "newStatus",
-                "type": "uint8"
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "timestamp",
-                "type": "uint256"
-            }
-        ],
-        "name": "BatchStatusSynced",
-        "type": "event"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "uint256",
-                "name": "inspectionId",
-                "type": "uint256"
-            },
-            {
-                "internalType": "enum InspectionManager.InspectionResult",
-                "name": "result",
-                "type": "uint8"
-            },
-            {
-                "internalType": "string",
-                "name": "fileUrl",
-                "type": "string"
-            },
-            {
-                "internalType": "string",
-                "name": "notes",
-                "type": "string"
-            }
-        ],
-        "name": "completeInspection",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "uint256",
-                "name": "batchId",
-                "type": "uint256"
-            },
-            {
-                "internalType": "string",
-                "name": "fileUrl",
-                "type": "string"
-            },
-            {
-                "internalType": "string",
-                "name": "notes",
-                "type": "string"
-            }
-        ],
-        "name": "createInspection",
-        "outputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "stateMutability": "nonpayable",
-        "type": "function"
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "uint256",
-                "name": "inspectionId",
-                "type": "uint256"
-            },
-            {
-                "indexed": True,
-                "internalType": "uint256",
-                "name": "batchId",
-                "type": "uint256"
-            },
-            {
-                "indexed": False,
-                "internalType": "enum InspectionManager.InspectionResult",
-                "name": "result",
-                "type": "uint8"
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "inspector",
-                "type": "address"
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "timestamp",
-                "type": "uint256"
-            }
-        ],
-        "name": "InspectionCompleted",
-        "type": "event"
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "uint256",
-                "name": "inspectionId",
-                "type": "uint256"
-            },
-            {
-                "indexed": True,
-                "internalType": "uint256",
-                "name": "batchId",
-                "type": "uint256"
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "inspector",
-                "type": "address"
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "timestamp",
-                "type": "uint256"
-            }
-        ],
-        "name": "InspectionCreated",
-        "type": "event"
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "uint256",
-                "name": "inspectionId",
-                "type": "uint256"
-            },
-            {
-                "indexed": True,
-                "internalType": "uint256",
-                "name": "batchId",
-                "type": "uint256"
-            },
-            {
-                "indexed": False,
-                "internalType": "enum InspectionManager.InspectionResult",
-                "name": "oldResult",
-                "type": "uint8"
-            },
-            {
-                "indexed": False,
-                "internalType": "enum InspectionManager.InspectionResult",
-                "name": "newResult",
-                "type": "uint8"
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "updatedBy",
-                "type": "address"
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "timestamp",
-                "type": "uint256"
-            }
-        ],
-        "name": "InspectionUpdated",
-        "type": "event"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "address",
-                "name": "_batchRegistryAddress",
-                "type": "address"
-            }
-        ],
-        "name": "updateBatchRegistry",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "uint256",
-                "name": "inspectionId",
-                "type": "uint256"
-            },
-            {
-                "internalType": "enum InspectionManager.InspectionResult",
-                "name": "result",
-                "type": "uint8"
-            },
-            {
-                "internalType": "string",
-                "name": "notes",
-                "type": "string"
-            }
-        ],
-        "name": "updateInspectionResult",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            },
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "name": "batchInspections",
-        "outputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [],
-        "name": "batchRegistry",
-        "outputs": [
-            {
-                "internalType": "contract BatchRegistry",
-                "name": "",
-                "type": "address"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "uint256",
-                "name": "batchId",
-                "type": "uint256"
-            }
-        ],
-        "name": "getBatchInspections",
-        "outputs": [
-            {
-                "internalType": "uint256[]",
-                "name": "",
-                "type": "uint256[]"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [],
-        "name": "getBatchRegistryAddress",
-        "outputs": [
-            {
-                "internalType": "address",
-                "name": "",
-                "type": "address"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "uint256",
-                "name": "inspectionId",
-                "type": "uint256"
-            }
-        ],
-        "name": "getInspection",
-        "outputs": [
-            {
-                "components": [
-                    {
-                        "internalType": "uint256",
-                        "name": "id",
-                        "type": "uint256"
-                    },
-                    {
-                        "internalType": "uint256",
-                        "name": "batchId",
-                        "type": "uint256"
-                    },
-                    {
-                        "internalType": "address",
-                        "name": "inspector",
-                        "type": "address"
-                    },
-                    {
-                        "internalType": "enum InspectionManager.InspectionResult",
-                        "name": "result",
-                        "type": "uint8"
-                    },
-                    {
-                        "internalType": "string",
-                        "name": "fileUrl",
-                        "type": "string"
-                    },
-                    {
-                        "internalType": "string",
-                        "name": "notes",
-                        "type": "string"
-                    },
-                    {
-                        "internalType": "uint256",
-                        "name": "inspectionDate",
-                        "type": "uint256"
-                    },
-                    {
-                        "internalType": "uint256",
-                        "name": "createdAt",
-                        "type": "uint256"
-                    },
-                    {
-                        "internalType": "uint256",
-                        "name": "updatedAt",
-                        "type": "uint256"
-                    },
-                    {
-                        "internalType": "bool",
-                        "name": "exists",
-                        "type": "bool"
-                    }
-                ],
-                "internalType": "struct InspectionManager.Inspection",
-                "name": "",
-                "type": "tuple"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "address",
-                "name": "inspector",
-                "type": "address"
-            }
-        ],
-        "name": "getInspectorInspections",
-        "outputs": [
-            {
-                "internalType": "uint256[]",
-                "name": "",
-                "type": "uint256[]"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "uint256",
-                "name": "batchId",
-                "type": "uint256"
-            }
-        ],
-        "name": "getLatestInspectionResult",
-        "outputs": [
-            {
-                "internalType": "enum InspectionManager.InspectionResult",
-                "name": "",
-                "type": "uint8"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [],
-        "name": "getTotalInspections",
-        "outputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "name": "inspections",
-        "outputs": [
-            {
-                "internalType": "uint256",
-                "name": "id",
-                "type": "uint256"
-            },
-            {
-                "internalType": "uint256",
-                "name": "batchId",
-                "type": "uint256"
-            },
-            {
-                "internalType": "address",
-                "name": "inspector",
-                "type": "address"
-            },
-            {
-                "internalType": "enum InspectionManager.InspectionResult",
-                "name": "result",
-                "type": "uint8"
-            },
-            {
-                "internalType": "string",
-                "name": "fileUrl",
-                "type": "string"
-            },
-            {
-                "internalType": "string",
-                "name": "notes",
-                "type": "string"
-            },
-            {
-                "internalType": "uint256",
-                "name": "inspectionDate",
-                "type": "uint256"
-            },
-            {
-                "internalType": "uint256",
-                "name": "createdAt",
-                "type": "uint256"
-            },
-            {
-                "internalType": "uint256",
-                "name": "updatedAt",
-                "type": "uint256"
-            },
-            {
-                "internalType": "bool",
-                "name": "exists",
-                "type": "bool"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "address",
-                "name": "",
-                "type": "address"
-            },
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "name": "inspectorInspections",
-        "outputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [
-            {
-                "internalType": "address",
-                "name": "inspector",
-                "type": "address"
-            }
-        ],
-        "name": "isAuthorizedInspector",
-        "outputs": [
-            {
-                "internalType": "bool",
-                "name": "",
-                "type": "bool"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [],
-        "name": "nextInspectionId",
-        "outputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [],
-        "name": "owner",
-        "outputs": [
-            {
-                "internalType": "address",
-                "name": "",
-                "type": "address"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [],
-        "name": "totalInspections",
-        "outputs": [
-            {
-                "internalType": "uint256",
-                "name": "",
-                "type": "uint256"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    }
-]
+# Multicall3 is deployed at the same address on every EVM chain (incl. Sepolia);
+# aggregate3 folds many view calls into a single eth_call
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+_AGGREGATE3_SELECTOR = bytes.fromhex('82ad56cb')   # aggregate3((address,bool,bytes)[])
+
+# Read-only views shared by every thread/request; still accessed as cfg['rpc_url']
+NETWORKS = MappingProxyType({k: MappingProxyType(v) for k, v in _RAW_NETWORKS.items()})
+CONTRACT_ADDRESSES = MappingProxyType({k: MappingProxyType(v) for k, v in _RAW_CONTRACT_ADDRESSES.items()})
+
+# Contract ABIs (obtained from Remix) live in abi/*.json and are loaded on first
+# access, so importing this module for NETWORKS/CONTRACT_ADDRESSES never parses them
+_ABI_DIR = Path(__file__).parent / 'abi'
+_ABI_FILES = {
+    'BATCH_REGISTRY_ABI': 'batch_registry.abi.json',
+    'INSPECTION_MANAGER_ABI': 'inspection_manager.abi.json',
+    'MULTICALL3_ABI': 'multicall3.abi.json',   # aggregate3 / aggregate3Value / blockAndAggregate only
+}
+_ABI_CACHE = {}
+
+# Leaf params that are identical across (and within) ABIs, e.g. {'name': 'batchId',
+# 'type': 'uint256'}, share one dict. web3 only reads ABI dicts, never mutates them
+_PARAM_POOL = {}
+
+def _compact_params(params):
+    """Drop `internalType` (web3 only encodes by `type`) and intern the repeated strings/dicts"""
+    compacted = []
+    for p in params:
+        p = {k: (_compact_params(v) if k == 'components' else sys.intern(v) if isinstance(v, str) else v)
+             for k, v in p.items() if k != 'internalType'}
+        if 'components' not in p:
+            p = _PARAM_POOL.setdefault(tuple(sorted(p.items())), p)
+        compacted.append(p)
+    return compacted
+
+def _compact_abi(abi_list):
+    """The ABI as plain lists and dicts (json.dumps/deepcopy-able), minus `internalType`"""
+    return [
+        {k: (_compact_params(v) if k in ('inputs', 'outputs') else v) for k, v in entry.items()}
+        for entry in abi_list
+    ]
+
+def _prebuild_abi(abi_list):
+    """Index an ABI once: 4-byte selector -> function entry, topic0 -> event entry"""
+    functions_by_selector = {}
+    events_by_topic = {}
+    for entry in abi_list:
+        if entry['type'] == 'function':
+            functions_by_selector['0x' + function_abi_to_4byte_selector(entry).hex()] = entry
+        elif entry['type'] == 'event':
+            events_by_topic['0x' + event_abi_to_log_topic(entry).hex()] = entry
+    return MappingProxyType({
+        'functions_by_selector': MappingProxyType(functions_by_selector),
+        'events_by_topic': MappingProxyType(events_by_topic),
+        'raw': abi_list,
+    })
+
+def _index_by_name(kind):
+    """name -> raw selector/topic bytes over both contracts ('owner' etc. match in both)"""
+    return MappingProxyType({
+        entry['name']: bytes.fromhex(key[2:])
+        for abi in ('BATCH_REGISTRY_ABI_PARSED', 'INSPECTION_MANAGER_ABI_PARSED')
+        for key, entry in _load_abi(abi)[kind].items()
+    })
+
+def _types_by_name(entry_type, key):
+    """name -> tuple of eth_abi type strings for `key` ('inputs'/'outputs') of every `entry_type`"""
+    return MappingProxyType({
+        entry['name']: tuple(collapse_if_tuple(p) for p in entry[key])
+        for abi in ('BATCH_REGISTRY_ABI', 'INSPECTION_MANAGER_ABI')
+        for entry in _load_abi(abi) if entry['type'] == entry_type
+    })
+
+def _event_topic_types():
+    """event name -> (indexed types, non-indexed types), i.e. topics[1:] vs data layout"""
+    return MappingProxyType({
+        entry['name']: (tuple(collapse_if_tuple(p) for p in entry['inputs'] if p.get('indexed')),
+                        tuple(collapse_if_tuple(p) for p in entry['inputs'] if not p.get('indexed')))
+        for abi in ('BATCH_REGISTRY_ABI', 'INSPECTION_MANAGER_ABI')
+        for entry in _load_abi(abi) if entry['type'] == 'event'
+    })
+
+def _fast_encoders():
+    """function name -> encoder(*args) returning calldata, selector and types bound once"""
+    from eth_abi import encode
+
+    def make_encoder(selector, types):
+        def encoder(*args):
+            return selector + encode(types, args)
+        return encoder
+
+    selectors, input_types = _load_abi('SELECTORS'), _load_abi('INPUT_TYPES')
+    return MappingProxyType({name: make_encoder(selectors[name], types) for name, types in input_types.items()})
+
+def _functions_where(abi, read_only):
+    """Function names of `abi` that are (read_only=True) or aren't view/pure"""
+    return frozenset(
+        entry['name'] for entry in _load_abi(abi)
+        if entry['type'] == 'function'
+        and (entry.get('stateMutability') in ('view', 'pure')) == read_only
+    )
+
+# Values computed from the ABIs on first access, memoized alongside them
+_DERIVED = {
+    'BATCH_REGISTRY_ABI_PARSED': lambda: _prebuild_abi(_load_abi('BATCH_REGISTRY_ABI')),
+    'INSPECTION_MANAGER_ABI_PARSED': lambda: _prebuild_abi(_load_abi('INSPECTION_MANAGER_ABI')),
+    'SELECTORS': lambda: _index_by_name('functions_by_selector'),
+    'TOPICS': lambda: _index_by_name('events_by_topic'),
+    # Event topic hash (used to filter events), raw bytes comparable with log['topics'][0]
+    'EVENT_SIGNATURES': lambda: MappingProxyType({
+        name: _load_abi('TOPICS')[name]
+        for name in ('BatchCreated', 'BatchStatusUpdated', 'InspectionCreated', 'InspectionCompleted')
+    }),
+    # eth_abi type tuples, e.g. INPUT_TYPES['getBatch'] == ('uint256',)
+    'INPUT_TYPES': lambda: _types_by_name('function', 'inputs'),
+    'OUTPUT_TYPES': lambda: _types_by_name('function', 'outputs'),
+    'EVENT_TOPIC_TYPES': _event_topic_types,
+    # Calldata encoders that skip web3's per-call ABI lookup; args must already be
+    # in eth_abi form (checksum/hex addresses, ints, str), no ENS or web3 normalization
+    'FAST_ENCODERS': _fast_encoders,
+    # eth_call-only functions (safe to fold into one batched request) vs transactions
+    'BATCH_REGISTRY_VIEW_FNS': lambda: _functions_where('BATCH_REGISTRY_ABI', True),
+    'BATCH_REGISTRY_TX_FNS': lambda: _functions_where('BATCH_REGISTRY_ABI', False),
+    'INSPECTION_MANAGER_VIEW_FNS': lambda: _functions_where('INSPECTION_MANAGER_ABI', True),
+    'INSPECTION_MANAGER_TX_FNS': lambda: _functions_where('INSPECTION_MANAGER_ABI', False),
+}
+
+def _load_abi(name):
+    """Return an ABI constant (see _ABI_FILES / _DERIVED), loading it on first use"""
+    abi = _ABI_CACHE.get(name)
+    if abi is None:
+        if name in _DERIVED:
+            abi = _DERIVED[name]()
+        else:
+            abi = _compact_abi(_json_loads((_ABI_DIR / _ABI_FILES[name]).read_bytes()))
+        _ABI_CACHE[name] = abi
+    return abi
+
+def __getattr__(name):
+    # BATCH_REGISTRY_ABI, INSPECTION_MANAGER_ABI, MULTICALL3_ABI, the *_PARSED indexes
+    # (pass ['raw'] to web3, use the maps to decode calldata and logs),
+    # SELECTORS (function name -> 4 bytes), TOPICS / EVENT_SIGNATURES (event name -> topic0 bytes),
+    # INPUT_TYPES / OUTPUT_TYPES / EVENT_TOPIC_TYPES, FAST_ENCODERS (function name ->
+    # calldata encoder) and the *_VIEW_FNS / *_TX_FNS partitions
+    if name in _ABI_FILES or name in _DERIVED:
+        return _load_abi(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Default network
 DEFAULT_NETWORK = 'testnet'
@@ -1189,31 +250,225 @@ INSPECTION_RESULT = {
     'NEEDS_RECHECK': 3
 }
 
-# Event topic hash (used to filter events)
-EVENT_SIGNATURES = {
-    'BatchCreated': '0x...',      # Can be calculated using web3.keccak(text='BatchCreated(...)')
-    'BatchStatusUpdated': '0x...',
-    'InspectionCreated': '0x...',
-    'InspectionCompleted': '0x...', 
+# Block tag policy for eth_call on each view (used by EthCallCacheMiddleware):
+#   'any'    - pure function, result is the same at every block: cache forever
+#   'pin'    - storage read; a 'latest' call is pinned to the current head block
+#              so (to, data, block) is a stable cache key
+#   'latest' - always sent as-is and never cached (counters, growing lists, auth
+#              checks); still cached when the caller pins a block number itself
+# Functions present in both contracts (owner, isAuthorizedInspector) share a selector,
+# so they must have the same policy in both
+BLOCK_TAG_POLICY = {
+    'BatchRegistry': {
+        'isValidStatusTransition': 'any',
+        'getBatch': 'pin',
+        'batches': 'pin',
+        'userBatches': 'pin',
+        'owner': 'pin',
+        'getUserBatches': 'latest',
+        'getTotalBatches': 'latest',
+        'totalBatches': 'latest',
+        'nextBatchId': 'latest',
+        'isAuthorizedInspector': 'latest',
+        'authorizedInspectors': 'latest',
+    },
+    'InspectionManager': {
+        'getInspection': 'pin',
+        'inspections': 'pin',
+        'batchInspections': 'pin',
+        'inspectorInspections': 'pin',
+        'getBatchRegistryAddress': 'pin',
+        'batchRegistry': 'pin',
+        'owner': 'pin',
+        'getBatchInspections': 'latest',
+        'getInspectorInspections': 'latest',
+        'getLatestInspectionResult': 'latest',
+        'getTotalInspections': 'latest',
+        'totalInspections': 'latest',
+        'nextInspectionId': 'latest',
+        'isAuthorizedInspector': 'latest',
+    },
 }
 
+@functools.lru_cache(maxsize=32)
 def get_network_config(network_name=None):
     """Get network configuration"""
     if network_name is None:
         network_name = DEFAULT_NETWORK
     return NETWORKS.get(network_name, NETWORKS[DEFAULT_NETWORK])
 
+@functools.lru_cache(maxsize=32)
 def get_contract_address(contract_name, network_name=None):
     """Get contract address"""
     if network_name is None:
         network_name = DEFAULT_NETWORK
     return CONTRACT_ADDRESSES.get(network_name, {}).get(contract_name)
 
+# One HTTPProvider per network, shared so every Web3 built on it reuses the same
+# pooled keep-alive session instead of reconnecting (TCP + TLS) each request
+_PROVIDERS = {}
+
+def get_provider(network_name=None):
+    """Get the shared HTTPProvider for a network"""
+    if network_name not in NETWORKS:
+        network_name = DEFAULT_NETWORK
+    provider = _PROVIDERS.get(network_name)
+    if provider is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from web3 import HTTPProvider
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        provider = HTTPProvider(NETWORKS[network_name]['rpc_url'], session=session,
+                                request_kwargs={'timeout': 10})
+        _PROVIDERS[network_name] = provider
+    return provider
+
+_WS_PROVIDERS = {}
+
+def get_read_provider(network_name=None):
+    """Get the shared provider for read floods, over the network's TRANSPORT_HINT"""
+    if network_name not in NETWORKS:
+        network_name = DEFAULT_NETWORK
+    if TRANSPORT_HINT.get(network_name) != 'ws':
+        return get_provider(network_name)
+    provider = _WS_PROVIDERS.get(network_name)
+    if provider is None:
+        from web3 import LegacyWebSocketProvider
+
+        provider = LegacyWebSocketProvider(NETWORKS[network_name]['ws_url'], websocket_timeout=10)
+        # Every thread shares this one socket; the provider itself doesn't serialize
+        # callers, so keep a single request in flight at a time
+        lock = threading.Lock()
+        make_request = provider.make_request
+
+        def locked_make_request(method, params):
+            with lock:
+                return make_request(method, params)
+
+        provider.make_request = locked_make_request
+        _WS_PROVIDERS[network_name] = provider
+    return provider
+
+# (network, block // cache_ttl_blocks) -> fee fields; only the current window is kept
+_FEE_CACHE = {}
+
+def compute_fees(w3, network_name=None):
+    """
+    Fee fields to merge into a transaction dict, per the network's fee_strategy.
+
+    EIP-1559 networks get maxFeePerGas/maxPriorityFeePerGas from one eth_feeHistory
+    call per cache_ttl_blocks blocks: priority = max(priority_fee_gwei, median
+    recent tip), max fee = next base fee * base_fee_multiplier + priority.
+    Legacy networks (or nodes reporting no base fee) get the configured gasPrice.
+    """
+    if network_name not in NETWORKS:
+        network_name = DEFAULT_NETWORK
+    config = NETWORKS[network_name]
+    strategy = config['fee_strategy']
+    if strategy['type'] != 'eip1559':
+        return {'gasPrice': config['gas_price']}
+
+    key = (network_name, w3.eth.block_number // strategy['cache_ttl_blocks'])
+    fees = _FEE_CACHE.get(key)
+    if fees is None:
+        history = w3.eth.fee_history(5, 'latest', [50])
+        base_fee = history['baseFeePerGas'][-1]   # base fee of the next block
+        if not base_fee:
+            fees = {'gasPrice': config['gas_price']}
+        else:
+            tips = sorted(reward[0] for reward in history.get('reward') or [])
+            priority = max(int(strategy['priority_fee_gwei'] * 10**9), tips[len(tips) // 2] if tips else 0)
+            fees = {
+                'maxFeePerGas': int(base_fee * strategy['base_fee_multiplier']) + priority,
+                'maxPriorityFeePerGas': priority,
+            }
+        _FEE_CACHE.clear()
+        _FEE_CACHE[key] = fees
+    return fees
+
+def wait_for_receipt(w3, tx_hash, network_name=None):
+    """
+    Wait for a transaction receipt, backing off between polls per the network's
+    poll policy instead of web3's fixed 0.1s loop. Raises TimeExhausted on timeout.
+    """
+    from web3.exceptions import TimeExhausted, TransactionNotFound
+
+    if network_name not in NETWORKS:
+        network_name = DEFAULT_NETWORK
+    poll = NETWORKS[network_name]['poll']
+    deadline = time.monotonic() + poll['receipt_timeout_ms'] / 1000
+    delay = poll['initial_ms'] / 1000
+    while True:
+        # Nothing is mined the instant it's sent, so sleep before each poll
+        time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+        try:
+            return w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            pass
+        if time.monotonic() >= deadline:
+            raise TimeExhausted(f"Transaction {tx_hash!r} not mined after {poll['receipt_timeout_ms']} ms")
+        delay = min(delay * poll['factor'], poll['max_ms'] / 1000)
+
+# Next nonce per (network, address) for the accounts this process sends from, so a
+# send needs no eth_getTransactionCount round trip once seeded. The counter is
+# per process: with several processes sending from one account (gunicorn workers)
+# it must be re-synced from the node on every send (cached=False)
+_NONCES = {}
+_NONCE_LOCK = threading.Lock()
+
+def next_nonce(w3, address, network_name=None, cached=True):
+    """
+    Reserve the next nonce for `address`.
+
+    cached: seed once from the node's pending count and count locally after that
+    (single sending process only). Otherwise ask the node every time and take the
+    higher of its pending count and the local counter.
+    """
+    if network_name not in NETWORKS:
+        network_name = DEFAULT_NETWORK
+    key = (network_name, address)
+    with _NONCE_LOCK:
+        nonce = _NONCES.get(key)
+        if nonce is None or not cached:
+            nonce = max(w3.eth.get_transaction_count(address, 'pending'), nonce or 0)
+        _NONCES[key] = nonce + 1
+    return nonce
+
+def reset_nonce(address, network_name=None):
+    """Drop the cached nonce after a failed send; the next next_nonce() re-syncs"""
+    if network_name not in NETWORKS:
+        network_name = DEFAULT_NETWORK
+    with _NONCE_LOCK:
+        _NONCES.pop((network_name, address), None)
+
+def build_multicall(calls):
+    """
+    Encode aggregate3 calldata for MULTICALL3_ADDRESS.
+
+    `calls` is an iterable of (target, allow_failure, call_data) - e.g.
+    (address, False, contract.encode_abi('getBatch', args=[batch_id])).
+    Decode the eth_call result as '(bool,bytes)[]', one entry per call.
+    """
+    from eth_abi import encode
+
+    calls = [(target, allow_failure, _as_bytes(call_data)) for target, allow_failure, call_data in calls]
+    return _AGGREGATE3_SELECTOR + encode(['(address,bool,bytes)[]'], [calls])
+
+def _as_bytes(data):
+    return bytes.fromhex(data[2:]) if isinstance(data, str) else bytes(data)
+
+_CONTRACT_ABIS = {
+    'BatchRegistry': 'BATCH_REGISTRY_ABI',
+    'InspectionManager': 'INSPECTION_MANAGER_ABI',
+}
+
 def get_contract_abi(contract_name):
     """Get contract ABI"""
-    if contract_name == 'BatchRegistry':
-        return BATCH_REGISTRY_ABI
-    elif contract_name == 'InspectionManager':
-        return INSPECTION_MANAGER_ABI
-    else:
-        raise ValueError(f"Unknown contract: {contract_name}")
\ No newline at end of file
+    abi_name = _CONTRACT_ABIS.get(contract_name)
+    if abi_name is None:
+        raise ValueError(f"Unknown contract: {contract_name}")
+    return _load_abi(abi_name)
\ No newline at end of file
@@ -1,6 +1,21 @@
+import atexit
+import contextlib
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import sqlite3
+
+# orjson serializes responses in C; optional, Flask's json otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Initialize extensions
 db = SQLAlchemy()
@@ -8,4 +23,89 @@ jwt = JWTManager()
 cors = CORS()
 
 
+class ORJSONProvider(DefaultJSONProvider):
+    """jsonify() through orjson; datetimes/Decimals still go through Flask's default()"""
+
+    _options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+    def _dumpb(self, obj, option=0):
+        option |= self._options | (orjson.OPT_SORT_KEYS if self.sort_keys else 0)
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        return self._dumpb(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """jsonify(): orjson's bytes go straight into the body, no str round trip"""
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        body = self._dumpb(obj, orjson.OPT_INDENT_2 if pretty else 0)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
+# Sent as one script per new connection. page_size only applies to a new, empty file
+# (init_db deletes the old one first); cache_size is per connection, in KiB when negative
+_SQLITE_PRAGMAS = (
+    "PRAGMA page_size=4096;"
+    "PRAGMA journal_mode=WAL;"
+    "PRAGMA synchronous=NORMAL;"
+    "PRAGMA cache_size=-64000;"
+)
+
+
+@event.listens_for(Engine, "connect")
+def _sqlite_pragmas(dbapi_conn, _):
+    """WAL + synchronous=NORMAL: commits append to the WAL without a full fsync each"""
+    if isinstance(dbapi_conn, sqlite3.Connection):
+        dbapi_conn.executescript(_SQLITE_PRAGMAS)
+
+
+@contextlib.contextmanager
+def transactional_ddl(engine):
+    """
+    engine.begin() whose DDL is inside the transaction on SQLite too.
+
+    pysqlite only opens a transaction before DML, so under a plain begin() every
+    CREATE/DROP/ALTER commits on its own. Here the driver's own transaction
+    handling is off (AUTOCOMMIT) and BEGIN/COMMIT are sent explicitly.
+    """
+    with engine.connect() as conn:
+        if conn.dialect.name != "sqlite":
+            with conn.begin():
+                yield conn
+            return
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        conn.exec_driver_sql("BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.exec_driver_sql("ROLLBACK")
+            raise
+        conn.exec_driver_sql("COMMIT")
+
+
+_log_listener = None
+
+
+def start_log_queue():
+    """
+    Put the root logger's handlers behind a QueueHandler: request threads only enqueue
+    records, and a listener thread does the formatting and stream/file I/O.
+    """
+    global _log_listener
+    if _log_listener:
+        return
+    root = logging.getLogger()
+    if not root.handlers:
+        logging.basicConfig(level=logging.INFO)
+    records = queue.SimpleQueue()
+    _log_listener = QueueListener(records, *root.handlers, respect_handler_level=True)
+    root.handlers = [QueueHandler(records)]
+    _log_listener.start()
+    atexit.register(_log_listener.stop)   # flush what is still queued on shutdown
+
+
 # Simple initialization of SQLAlchemy, JWTManager and CORS.
\ No newline at end of file
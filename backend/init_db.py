@@ -1,36 +1,102 @@
 import os
+import sys
+import json
+from datetime import date, datetime
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateIndex, CreateTable
 from app import create_app
-from extensions import db
+from extensions import db, transactional_ddl
+from models.user import User
+from models.batch import Batch
+from models.inspection import Inspection
 
 
-from config import Config
-uri = Config.SQLALCHEMY_DATABASE_URI
 
+def reset_sqlite_file():
+    """Delete the SQLite database file, if any, so create_all starts from scratch"""
+    # Flask-SQLAlchemy has already resolved relative sqlite:/// paths (into the
+    # instance folder), so the engine URL holds the real file location
+    url = db.engine.url
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        print("env not sqlite database")
+        return
+
+    db_path = url.database
+    db.engine.dispose()
 
-# Delete the database file if it exists
-if uri.startswith("sqlite:///"):
-    # Handle both relative and absolute paths
-    if uri.startswith("sqlite:////"):
-        db_path = uri.replace("sqlite:////", "/")
-    else:
-        db_path = uri.replace("sqlite:///", "")
-    
     # Ensure directory exists
     db_dir = os.path.dirname(db_path)
     if db_dir and not os.path.exists(db_dir):
         os.makedirs(db_dir, exist_ok=True)
         print(f"Created directory: {db_dir}")
-    
+
     if os.path.exists(db_path):
         print(f"🗑️  Old database file detected: {db_path}, deleting...")
         os.remove(db_path)
         print("  Old database deleted")
 
-else:
-    print("env not sqlite database")
 
-# Create new database
+def seed(mappings_by_model):
+    """
+    Bulk-insert initial rows in a single transaction.
+
+    mappings_by_model: {Model: [column dicts]}. Models are inserted in FK order
+    (users -> batches -> inspections), so rows may reference ids seeded before them.
+    """
+    with db.session.no_autoflush:
+        for model in (User, Batch, Inspection):
+            rows = mappings_by_model.get(model)
+            if rows:
+                db.session.bulk_insert_mappings(model, rows)
+    db.session.commit()
+
+
+def _load_seed_file(path):
+    """Read {"users": [...], "batches": [...], "inspections": [...]} with ISO date strings"""
+    with open(path) as f:
+        data = json.load(f)
+    mappings = {}
+    for model, key in ((User, "users"), (Batch, "batches"), (Inspection, "inspections")):
+        rows = data.get(key, [])
+        for row in rows:
+            for column in model.__table__.columns:
+                value = row.get(column.key)
+                if isinstance(value, str) and isinstance(column.type, db.DateTime):
+                    row[column.key] = datetime.fromisoformat(value)
+                elif isinstance(value, str) and isinstance(column.type, db.Date):
+                    row[column.key] = date.fromisoformat(value)
+        mappings[model] = rows
+    return mappings
+
+
+def create_schema():
+    """
+    Create all tables and indexes in one transaction (on SQLite too, see
+    transactional_ddl), so they commit together.
+
+    On an empty server database (Postgres/MySQL) the CREATE statements are sent
+    without create_all's has_table check per table. They go one per execute():
+    DB-API drivers generally refuse several statements in one call. A local
+    SQLite file has no round trips to save.
+    """
+    with transactional_ddl(db.engine) as conn:
+        if conn.dialect.name == "sqlite" or inspect(conn).get_table_names():
+            db.metadata.create_all(conn)
+            return
+        for table in db.metadata.sorted_tables:   # FK parents first
+            conn.execute(CreateTable(table))
+            for index in table.indexes:
+                conn.execute(CreateIndex(index))
+
+
+# Create new database, optionally seeded: python init_db.py seed.json
 app = create_app()
 with app.app_context():
-    db.create_all()
+    reset_sqlite_file()
+
+    create_schema()
     print("Sqlite database initialized")
+
+    if len(sys.argv) > 1:
+        seed(_load_seed_file(sys.argv[1]))
+        print(f"Seeded database from {sys.argv[1]}")
@@ -0,0 +1,128 @@
+"""
+Bring an existing database up to the current models, in place: python migrate_db.py
+
+init_db.py recreates the database from scratch; this keeps the rows. Each step
+checks the live schema first, so running it again is a no-op.
+
+- batches.status / inspections.result: VARCHAR names -> SMALLINT enum values
+- batches.harvest_ts / expiry_ts / created_ts: added and backfilled from the dates.
+  created_ts is true epoch seconds (created_at is naive UTC). The list API's
+  createdAt/timestamp used to read created_at as server-local time, so on a
+  server not running in UTC those values change by the UTC offset
+"""
+from sqlalchemy import BigInteger, String, and_, bindparam, case, column, func, inspect, or_, select, MetaData
+from sqlalchemy.schema import CreateTable, DropTable
+from app import create_app
+from extensions import db, transactional_ddl
+from models.batch import Batch, BatchStatus, _EPOCH_COLUMNS, _UTC_COLUMNS, _epoch
+from models.inspection import Inspection, InspectionResult
+
+
+# (table, column, IntEnum) stored through models.types.EnumName
+_ENUM_COLUMNS = (
+    (Batch.__table__, "status", BatchStatus),
+    (Inspection.__table__, "result", InspectionResult),
+)
+
+
+def _check_enum_names(conn, table, name, enum_cls):
+    """Raise, naming them, if stored values have no member in enum_cls (they'd convert to NULL)"""
+    names = [m.name.lower() for m in enum_cls]
+    unknown = conn.execute(
+        select(func.count(), column(name, String)).select_from(table)
+        .where(column(name, String).isnot(None), func.lower(column(name, String)).notin_(names))
+        .group_by(column(name, String))
+    ).all()
+    if unknown:
+        found = ", ".join(f"{value!r} ({count} rows)" for count, value in unknown)
+        raise ValueError(f"{table.name}.{name} has values that are not {enum_cls.__name__} names: "
+                         f"{found}. Valid: {', '.join(names)}; update those rows and run again")
+
+
+def _enum_value_sql(conn, name, enum_cls):
+    """SQL mapping the column's stored name (any case) to the enum's integer value"""
+    expr = case({m.name.lower(): int(m) for m in enum_cls}, value=func.lower(column(name, String)))
+    return str(expr.compile(conn, compile_kwargs={"literal_binds": True}))
+
+
+def _rebuild_sqlite_table(conn, table, converted):
+    """
+    SQLite can't change a column's type, and a VARCHAR column would keep the new
+    integers as text: copy the rows into a table built from the model, then swap it in.
+
+    converted: {column name: SQL expression} used in place of the old column.
+    """
+    metadata = MetaData()
+    for t in db.metadata.sorted_tables:   # so the copy's foreign keys resolve
+        t.to_metadata(metadata)
+    new = table.to_metadata(metadata, name=f"{table.name}_new")
+    old_columns = {c["name"] for c in inspect(conn).get_columns(table.name)}
+    names = [c.name for c in table.columns if c.name in old_columns]
+
+    conn.exec_driver_sql(f"DROP TABLE IF EXISTS {new.name}")   # left by an interrupted run
+    conn.execute(CreateTable(new))
+    conn.exec_driver_sql(
+        f"INSERT INTO {new.name} ({', '.join(names)}) "
+        f"SELECT {', '.join(converted.get(n, n) for n in names)} FROM {table.name}"
+    )
+    conn.execute(DropTable(table))   # drops its indexes too
+    conn.exec_driver_sql(f"ALTER TABLE {new.name} RENAME TO {table.name}")
+    for index in table.indexes:
+        index.create(conn)
+
+
+def convert_enum_columns(conn):
+    """Store status/result as their enum's integer value where they are still strings"""
+    for table, name, enum_cls in _ENUM_COLUMNS:
+        current = {c["name"]: c["type"] for c in inspect(conn).get_columns(table.name)}
+        if not isinstance(current.get(name), String):
+            continue
+        _check_enum_names(conn, table, name, enum_cls)
+        value_sql = _enum_value_sql(conn, name, enum_cls)
+        dialect = conn.dialect.name
+        if dialect == "sqlite":
+            _rebuild_sqlite_table(conn, table, {name: value_sql})
+        elif dialect == "postgresql":
+            conn.exec_driver_sql(
+                f"ALTER TABLE {table.name} ALTER COLUMN {name} TYPE SMALLINT USING {value_sql}")
+        else:
+            # MySQL: store the numbers as text first, MODIFY then converts them
+            ddl_type = table.c[name].type.compile(conn.dialect)
+            null = "" if table.c[name].nullable else " NOT NULL"
+            conn.exec_driver_sql(f"UPDATE {table.name} SET {name} = {value_sql}")
+            conn.exec_driver_sql(f"ALTER TABLE {table.name} MODIFY {name} {ddl_type}{null}")
+        print(f"Converted {table.name}.{name} to SMALLINT")
+
+
+def backfill_epoch_columns(conn):
+    """Add Batch's epoch-seconds columns where missing and fill them from the date columns"""
+    table = Batch.__table__
+    current = {c["name"] for c in inspect(conn).get_columns(table.name)}
+    for ts_name in _EPOCH_COLUMNS.values():
+        if ts_name not in current:
+            conn.exec_driver_sql(
+                f"ALTER TABLE {table.name} ADD COLUMN {ts_name} {BigInteger().compile(conn.dialect)}")
+            print(f"Added {table.name}.{ts_name}")
+
+    missing = or_(*(and_(table.c[ts].is_(None), table.c[name].isnot(None))
+                    for name, ts in _EPOCH_COLUMNS.items()))
+    rows = conn.execute(select(table.c.id, *(table.c[name] for name in _EPOCH_COLUMNS)).where(missing))
+    params = [
+        {"row_id": row.id, **{f"new_{ts}": _epoch(row._mapping[name], name in _UTC_COLUMNS)
+                              for name, ts in _EPOCH_COLUMNS.items()}}
+        for row in rows
+    ]
+    if params:
+        stmt = (table.update().where(table.c.id == bindparam("row_id"))
+                .values({ts: bindparam(f"new_{ts}") for ts in _EPOCH_COLUMNS.values()}))
+        conn.execute(stmt, params)
+    print(f"Backfilled epoch columns for {len(params)} batches")
+
+
+if __name__ == "__main__":
+    app = create_app()
+    with app.app_context():
+        with transactional_ddl(db.engine) as conn:   # all steps, or none (DDL included)
+            convert_enum_columns(conn)
+            backfill_epoch_columns(conn)
+        print("Database migrated")
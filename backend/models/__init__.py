@@ -1,4 +1,4 @@
 from extensions import db
 from .user import User
-from .batch import Batch
-from .inspection import Inspection
+from .batch import Batch, BatchStatus
+from .inspection import Inspection, InspectionResult
@@ -1,10 +1,60 @@
 from extensions import db
-from datetime import datetime
+from sqlalchemy import insert
+from sqlalchemy.sql import func
+from sqlalchemy.orm import validates
+from datetime import date, datetime, timezone
+from enum import IntEnum
 import json
+import time
+from .types import EnumName
+
+
+class BatchStatus(IntEnum):
+    """Same values as deploy_config.BATCH_STATUS / BatchRegistry's on-chain enum"""
+    PENDING = 0
+    INSPECTED = 1
+    APPROVED = 2
+    REJECTED = 3
+
+
+def _parse_date(value):
+    """YYYY-MM-DD -> date; fromisoformat is C, strptime only for unpadded forms"""
+    if len(value) == 10 and value[4] == value[7] == '-':
+        return date.fromisoformat(value)
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _epoch(value, utc=False):
+    """Epoch seconds for a date (local midnight) or naive datetime (local time, UTC if utc)"""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    elif utc and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def _epoch_default(column, now=False):
+    """Column default deriving epoch seconds from another column of the same INSERT
+    (covers bulk_insert_mappings, which skips the @validates hooks)"""
+    def default(context):
+        value = _epoch(context.get_current_parameters().get(column), column in _UTC_COLUMNS)
+        return int(time.time()) if value is None and now else value
+    return default
+
+
+_EPOCH_COLUMNS = {'harvest_date': 'harvest_ts', 'expiry_date': 'expiry_ts', 'created_at': 'created_ts'}
+# Naive datetimes holding UTC (the DB's now()), not local time
+_UTC_COLUMNS = frozenset({'created_at'})
 
 
 class Batch(db.Model):
     __tablename__ = "batches"
+    __table_args__ = (
+        # list_batches filters on status and pages in id order: one index range scan
+        db.Index('ix_batches_status_id', 'status', 'id'),
+    )
 
     # Primary key
     id = db.Column(db.Integer, primary_key=True)
@@ -22,14 +72,19 @@ class Batch(db.Model):
     # Date information
     harvest_date = db.Column(db.Date)                                    # Harvest date
     expiry_date = db.Column(db.Date)                                     # Expiry date
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)         # Created time
+    created_at = db.Column(db.DateTime, server_default=func.now())       # Created time (UTC, set by the DB)
+    
+    # The dates above as epoch seconds, kept in sync on write so list_batches reads them raw
+    harvest_ts = db.Column(db.BigInteger, default=_epoch_default('harvest_date'))
+    expiry_ts = db.Column(db.BigInteger, default=_epoch_default('expiry_date'))
+    created_ts = db.Column(db.BigInteger, default=_epoch_default('created_at', now=True))
     
     # Product characteristics
     organic = db.Column(db.Boolean, default=False)                       # Whether organic
     import_product = db.Column(db.Boolean, default=False)                # Whether imported
     
     # Status management
-    status = db.Column(db.String(20), default="pending")                 # Status: pending/inspected/approved/rejected
+    status = db.Column(EnumName(BatchStatus), default="pending")  # Status: pending/inspected/approved/rejected
     
     # Association relationship
     owner_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)  # Batch creator
@@ -37,8 +92,15 @@ class Batch(db.Model):
     # Blockchain related
     blockchain_tx = db.Column(db.String(66))                             # Blockchain transaction hash
     
-    # Reverse association: one batch can have multiple inspection records
-    inspections = db.relationship('Inspection', backref='batch', lazy=True)
+    # Reverse association: one batch can have multiple inspection records.
+    # Loaded eagerly with every Batch; queries that never read it opt out with
+    # options(lazyload(Batch.inspections)) (or noload)
+    inspections = db.relationship('Inspection', backref='batch', lazy='selectin')
+    
+    @validates('harvest_date', 'expiry_date', 'created_at')
+    def _sync_epoch(self, key, value):
+        setattr(self, _EPOCH_COLUMNS[key], _epoch(value, key in _UTC_COLUMNS))
+        return value
     
     def __repr__(self):
         return f"<Batch {self.batch_number}: {self.product_name}>"
@@ -68,6 +130,11 @@ class Batch(db.Model):
     @classmethod
     def from_dict(cls, data, owner_id):
         """Create batch object from dictionary"""
+        return cls(**cls._to_mapping(data, owner_id))
+
+    @classmethod
+    def _to_mapping(cls, data, owner_id):
+        """Column values for one batch from the API's {"metadata": {...}} shape"""
         metadata = data.get('metadata', {})
         
         # Parse date string
@@ -75,12 +142,12 @@ class Batch(db.Model):
         expiry_date = None
         
         if metadata.get('harvestDate'):
-            harvest_date = datetime.strptime(metadata['harvestDate'], '%Y-%m-%d').date()
+            harvest_date = _parse_date(metadata['harvestDate'])
         
         if metadata.get('expiryDate'):
-            expiry_date = datetime.strptime(metadata['expiryDate'], '%Y-%m-%d').date()
+            expiry_date = _parse_date(metadata['expiryDate'])
         
-        return cls(
+        return dict(
             batch_number=metadata.get('batchNumber', f"BATCH-{datetime.now().strftime('%Y%m%d%H%M%S')}"),
             product_name=metadata.get('productName'),
             origin=metadata.get('origin'),
@@ -93,3 +160,32 @@ class Batch(db.Model):
             import_product=metadata.get('import', False),
             owner_id=owner_id
         )
+
+    @classmethod
+    def insert_from_dict(cls, data, owner_id, **values):
+        """
+        INSERT one batch as a single INSERT ... RETURNING, without the unit of work.
+
+        values: extra column values (e.g. blockchain_tx). Returns the new row's
+        (id, status, batch_number); the caller commits.
+        """
+        stmt = (insert(cls)
+                .values(**cls._to_mapping(data, owner_id), **values)
+                .returning(cls.id, cls.status, cls.batch_number))
+        return db.session.execute(stmt).one()
+
+    @classmethod
+    def bulk_insert(cls, dicts, owner_id):
+        """Insert many batches with one executemany and a single commit; returns the row count"""
+        rows = [cls._to_mapping(d, owner_id) for d in dicts]
+        # Generated batch numbers are per-second, so suffix them to keep them unique
+        for i, (d, row) in enumerate(zip(dicts, rows)):
+            if 'batchNumber' not in d.get('metadata', {}):
+                row['batch_number'] = f"{row['batch_number']}-{i}"
+        try:
+            db.session.bulk_insert_mappings(cls, rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return len(rows)
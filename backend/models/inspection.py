@@ -1,9 +1,24 @@
 from extensions import db
-from datetime import datetime
+from sqlalchemy.sql import func
+from enum import IntEnum
+from .types import EnumName
+
+
+class InspectionResult(IntEnum):
+    """Same values as deploy_config.INSPECTION_RESULT / InspectionManager's on-chain enum"""
+    PENDING = 0
+    PASSED = 1
+    FAILED = 2
+    NEEDS_RECHECK = 3
 
 
 class Inspection(db.Model):
     __tablename__ = "inspections"
+    __table_args__ = (
+        # SQLite doesn't index foreign keys; Batch.inspections loads by batch_id,
+        # and list_batches reads each batch's inspections newest first
+        db.Index('ix_inspections_batch_created', 'batch_id', db.text('created_at DESC')),
+    )
 
     # Primary key
     id = db.Column(db.Integer, primary_key=True)
@@ -13,12 +28,12 @@ class Inspection(db.Model):
     inspector_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)   # Inspector ID
     
     # Inspection result
-    result = db.Column(db.String(20), nullable=False)                # Inspection result: pass/fail/pending
+    result = db.Column(EnumName(InspectionResult), nullable=False)   # Inspection result: passed/failed/needs_recheck/pending
     file_url = db.Column(db.Text)                                    # PDF inspection report link
     
     # Time information
-    insp_date = db.Column(db.DateTime, default=datetime.utcnow)      # Inspection date
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)     # Created time
+    insp_date = db.Column(db.DateTime, server_default=func.now())    # Inspection date (UTC, set by the DB)
+    created_at = db.Column(db.DateTime, server_default=func.now())   # Created time (UTC, set by the DB)
     
     # Blockchain related
     blockchain_tx = db.Column(db.String(66))                         # Blockchain transaction hash
@@ -26,6 +41,9 @@ class Inspection(db.Model):
     # Notes
     notes = db.Column(db.Text)                                       # Inspection notes
     
+    # Inspector account (email is shown in batch listings)
+    inspector = db.relationship('User')
+    
     def __repr__(self):
         return f"<Inspection {self.id}: {self.result} for Batch {self.batch_id}>"
     
@@ -45,10 +63,30 @@ class Inspection(db.Model):
     @classmethod
     def from_dict(cls, data, batch_id, inspector_id):
         """Create inspection object from dictionary"""
-        return cls(
+        return cls(**cls._to_mapping(data, batch_id, inspector_id))
+
+    @classmethod
+    def _to_mapping(cls, data, batch_id, inspector_id):
+        """Column values for one inspection from the API's request shape"""
+        return dict(
             batch_id=batch_id,
             inspector_id=inspector_id,
             result=data.get('result', 'pending'),
             file_url=data.get('fileUrl'),
             notes=data.get('notes')
         )
+
+    @classmethod
+    def bulk_insert(cls, dicts, batch_id, inspector_id):
+        """Insert many inspections of one batch with a single commit; returns the row count.
+
+        The batch must already be flushed (it is the FK parent of every row).
+        """
+        rows = [cls._to_mapping(d, batch_id, inspector_id) for d in dicts]
+        try:
+            db.session.bulk_insert_mappings(cls, rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return len(rows)
@@ -0,0 +1,34 @@
+from extensions import db
+
+
+class EnumName(db.TypeDecorator):
+    """
+    Store an IntEnum as a SMALLINT while the model keeps using lower-case names.
+
+    `batch.status == 'pending'`, `Batch.status == 'pending'` filters and to_dict()
+    all see strings; the database only ever sees the enum's integer value.
+    """
+    impl = db.SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls):
+        super().__init__()
+        self.enum_cls = enum_cls
+        self._values = {m.name.lower(): int(m) for m in enum_cls}
+        self._names = {int(m): m.name.lower() for m in enum_cls}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, int) and value in self._names:
+            return int(value)
+        if isinstance(value, str) and value.lower() in self._values:
+            return self._values[value.lower()]
+        raise ValueError(f"Invalid {self.enum_cls.__name__}: {value!r}")
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            raise ValueError(f"{self.enum_cls.__name__} stored as text ({value!r}); run migrate_db.py")
+        return self._names[value]
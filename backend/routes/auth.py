@@ -3,12 +3,85 @@ from extensions import db
 from flask_jwt_extended import (
     create_access_token, jwt_required, get_jwt_identity
 )
-from datetime import timedelta
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as HashTimeout
+from eth_utils import to_checksum_address
 from werkzeug.security import generate_password_hash, check_password_hash
 from models.user import User
 
+# argon2 (C) for new hashes when installed; werkzeug hashes still verify and are
+# upgraded to argon2 on the user's next successful login
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import VerificationError
+    _hasher = PasswordHasher()
+except ImportError:
+    _hasher = None
+
 auth_bp = Blueprint("auth", __name__)
 
+# 0x + 40 hex digits; checked in one C-level match
+_ADDR_RE = re.compile(r"0x[0-9a-fA-F]{40}")
+
+
+# Password hashing runs on this pool rather than inline. scrypt/argon2 release the GIL,
+# so the threads use every core. ThreadPoolExecutor's own queue is unbounded: at most
+# HASH_QUEUE_LIMIT jobs are running or waiting, and a login past that gets a 503 at once
+_HASH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="pwhash")
+HASH_TIMEOUT = 2   # seconds
+HASH_QUEUE_LIMIT = 4 * (os.cpu_count() or 1)
+_hash_slots = threading.BoundedSemaphore(HASH_QUEUE_LIMIT)
+
+
+def _run_hash(fn, *args):
+    """fn(*args) on _HASH_POOL; raises HashTimeout when the pool is full, or on timeout
+    (dropping the job if still queued)"""
+    if not _hash_slots.acquire(blocking=False):
+        raise HashTimeout
+    try:
+        future = _HASH_POOL.submit(fn, *args)
+    except BaseException:
+        _hash_slots.release()
+        raise
+    future.add_done_callback(lambda _: _hash_slots.release())   # also runs on cancel
+    try:
+        return future.result(timeout=HASH_TIMEOUT)
+    except HashTimeout:
+        future.cancel()
+        raise
+
+
+def _hash(password):
+    return _hasher.hash(password) if _hasher else generate_password_hash(password)
+
+
+def _check(stored, password):
+    """(matches, replacement hash or None); touches no ORM state, so safe off-thread"""
+    if _hasher and stored.startswith("$argon2"):
+        try:
+            _hasher.verify(stored, password)
+        except VerificationError:
+            return False, None
+        return True, (_hasher.hash(password) if _hasher.check_needs_rehash(stored) else None)
+
+    if not check_password_hash(stored, password):
+        return False, None
+    return True, (_hasher.hash(password) if _hasher else None)
+
+
+def hash_password(password):
+    return _run_hash(_hash, password)
+
+
+def verify_password(user, password):
+    """Check the password, rehashing legacy/outdated hashes (caller commits)"""
+    ok, new_hash = _run_hash(_check, user.password_hash, password)
+    if new_hash:
+        user.password_hash = new_hash
+    return ok
+
 # ---------- Registration ----------
 @auth_bp.post("/register")
 def register():
@@ -26,9 +99,13 @@ def register():
         return jsonify(message="Email already exists"), 403
 
     # Create user
+    try:
+        password_hash = hash_password(password)
+    except HashTimeout:
+        return jsonify(message="server busy, try again"), 503
     user = User(
         email=email,
-        password_hash=generate_password_hash(password),
+        password_hash=password_hash,
         role=role
     )
 
@@ -55,14 +132,19 @@ def login():
         return jsonify(message="invalid email"), 403
    
     # Password doesn't match
-    if not check_password_hash(user.password_hash, password):
+    try:
+        matches = verify_password(user, password)
+    except HashTimeout:
+        return jsonify(message="server busy, try again"), 503
+    if not matches:
         return jsonify(message="password error"), 401
+    if db.session.is_modified(user):
+        db.session.commit()   # hash was upgraded
 
     token = create_access_token(
         identity=str(user.id),
-        additional_claims={"role": user.role},
-        expires_delta=timedelta(minutes=30)
-    )
+        additional_claims={"role": user.role}
+    )   # expiry comes from JWT_ACCESS_TOKEN_EXPIRES (30 minutes)
     
     return jsonify(message="login success",
         token=token,
@@ -78,10 +160,12 @@ def bind_wallet():
     data       = request.get_json() or {}
     wallet     = data.get("wallet", "")
 
-    if not wallet.startswith("0x") or len(wallet) != 42:
-        return jsonify(message="bad address,length not = 42"), 400
+    if not isinstance(wallet, str) or not _ADDR_RE.fullmatch(wallet):
+        return jsonify(message="bad address, expected 0x + 40 hex chars"), 400
+    # Store the checksummed form so later lookups need no normalization
+    wallet = to_checksum_address(wallet)
 
-    user = User.query.get(current_id)
+    user = db.session.get(User, int(current_id))
     if not user:
         return jsonify(message="User not found"), 404
     
@@ -1,16 +1,178 @@
 # Responsibility: Handle HTTP request/response, parameter validation, call business logic
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
-from models.batch import Batch
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt
+from werkzeug.exceptions import InternalServerError
+from models.batch import Batch, _epoch
 from models.user import User
 from services.batch_service import BatchService
 from extensions import db
 from web3 import Web3
-from deploy_config import get_network_config, get_contract_address, get_contract_abi
+from web3.exceptions import ProviderConnectionError
+from deploy_config import (get_network_config, get_contract_address, get_contract_abi, get_provider,
+                           wait_for_receipt, next_nonce, reset_nonce, FAST_ENCODERS,
+                           DEVELOPMENT_PRIVATE_KEYS)
+import json
+import logging
 import time
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from datetime import datetime
+from sqlalchemy import false, update, delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import aliased, joinedload, lazyload, load_only
 from models.inspection import Inspection
 
 batch_bp = Blueprint('batch', __name__)
+logger = logging.getLogger(__name__)
+
+# Guards lazy creation of the per-app Web3 / contract objects below
+_W3_LOCK = threading.Lock()
+
+
+def get_w3():
+    """Shared testnet Web3 for this app; its HTTPProvider keeps pooled keep-alive sockets"""
+    w3 = current_app.extensions.get('web3')
+    if w3 is None:
+        with _W3_LOCK:
+            w3 = current_app.extensions.get('web3')
+            if w3 is None:
+                w3 = current_app.extensions['web3'] = Web3(get_provider('testnet'))
+    return w3
+
+
+def get_contract(contract_name):
+    """Testnet contract object (BatchRegistry/InspectionManager), built once per app"""
+    contracts = current_app.extensions.setdefault('web3_contracts', {})
+    contract = contracts.get(contract_name)
+    if contract is None:
+        w3 = get_w3()
+        with _W3_LOCK:
+            contract = contracts.get(contract_name)
+            if contract is None:
+                contract = contracts[contract_name] = w3.eth.contract(
+                    address=get_contract_address(contract_name, 'testnet'),
+                    abi=get_contract_abi(contract_name)
+                )
+    return contract
+
+# Background receipt confirmation for ASYNC_TX_CONFIRM (see create_batch)
+_TX_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="txconfirm")
+
+# What an unreachable RPC endpoint raises from a real call (there is no is_connected() probe)
+_RPC_CONNECTION_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                          ProviderConnectionError)
+
+# Overlaps RPC reads with the request's own DB work
+_RPC_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="rpc")
+
+# Recent getBatch results for compare_batch_status; on-chain state rarely changes
+# between a dashboard's polls, so repeated compares skip the RPC
+ONCHAIN_CACHE_TTL = 5
+ONCHAIN_CACHE_SIZE = 1024
+_onchain_batches = {}   # (contract address, batch id) -> (fetched_at, getBatch result)
+
+
+def get_onchain_batch(contract, batch_id):
+    """contract.getBatch(batch_id), reusing a result up to ONCHAIN_CACHE_TTL seconds old"""
+    key = (contract.address, batch_id)
+    now = time.monotonic()
+    hit = _onchain_batches.get(key)
+    if hit and now - hit[0] < ONCHAIN_CACHE_TTL:
+        return hit[1]
+    value = contract.functions.getBatch(batch_id).call()
+    if len(_onchain_batches) >= ONCHAIN_CACHE_SIZE:
+        _onchain_batches.pop(next(iter(_onchain_batches)))   # drop the oldest entry
+    _onchain_batches[key] = (now, value)
+    return value
+
+
+def _confirm_batch_tx(app, batch_id, tx_hash, w3):
+    """
+    Wait for a createBatch receipt, then record the tx hash on the batch row.
+    A reverted or never-mined transaction removes the row, matching the sync path
+    where such a batch is never stored. Clients poll GET /batches/<id>:
+    blockchainTx null = pending, set = confirmed, 404 = failed.
+    """
+    with app.app_context():
+        try:
+            receipt = wait_for_receipt(w3, tx_hash, 'testnet')
+            confirmed = receipt.status == 1
+        except Exception as e:
+            logger.error("❌ Receipt wait failed for batch %s: %s", batch_id, e)
+            confirmed = False
+        try:
+            if confirmed:
+                db.session.execute(
+                    update(Batch).where(Batch.id == batch_id).values(blockchain_tx=tx_hash.hex())
+                )
+            else:
+                db.session.execute(delete(Batch).where(Batch.id == batch_id))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error("❌ Failed to record receipt for batch %s: %s", batch_id, e)
+
+
+# Error responses whose body never varies: encoded once at import, served as-is
+def _static_error(error, message, status):
+    body = json.dumps({'error': error, 'message': message}, separators=(',', ':'), sort_keys=True)
+    return (body + '\n').encode(), status
+
+
+def error_response(body, status):
+    """Response for a _static_error() (body, status) pair"""
+    return Response(body, status=status, mimetype='application/json')
+
+
+_ERR_PRODUCERS_ONLY = _static_error('Access denied', 'Only producers can create batches', 403)
+_ERR_BODY_REQUIRED = _static_error('Invalid request', 'Request body is required', 400)
+_ERR_METADATA_REQUIRED = _static_error('Invalid request', 'metadata is required', 400)
+_ERR_GET_FAILED = _static_error('Internal server error', 'Failed to retrieve batch', 500)
+_ERR_OWN_BATCHES_ONLY = _static_error('Access denied', 'You can only update your own batches', 403)
+_ERR_STATUS_REQUIRED = _static_error('Invalid request', 'status is required', 400)
+_ERR_UPDATE_FAILED = _static_error('Internal server error', 'Failed to update batch status', 500)
+_ERR_BAD_PAGING = _static_error('Invalid request', 'page and per_page must be integers', 400)
+
+
+_READ_ENDPOINTS = frozenset({'batch.get_batch', 'batch.list_batches'})
+
+
+@batch_bp.errorhandler(SQLAlchemyError)
+@batch_bp.errorhandler(InternalServerError)
+def handle_read_error(e):
+    """
+    500 body for a failed read (get_batch / list_batches), in place of per-handler
+    try/except. Database errors are handled here even when exceptions propagate
+    (TESTING); anything else arrives wrapped in InternalServerError. Errors from
+    the other batch endpoints get Flask's default handling.
+    """
+    if request.endpoint not in _READ_ENDPOINTS:
+        if isinstance(e, InternalServerError):
+            return e
+        raise e
+    error = getattr(e, 'original_exception', None) or e
+    if isinstance(error, SQLAlchemyError):
+        db.session.rollback()
+    if request.endpoint == 'batch.list_batches':
+        logger.error("Error in list_batches: %s", error)
+        return jsonify({
+            'error': 'Internal server error',
+            'message': f'Failed to retrieve batches: {str(error)}'
+        }), 500
+    return error_response(*_ERR_GET_FAILED)
+
+
+# Fields of create_batch's 201 response that are the same for every new batch
+# (it has no inspection yet, so no result or file)
+_CREATE_BATCH_RESPONSE = {
+    'message': 'Batch created successfully',
+    'exists': True,
+    'fileUrl': 'none',
+    'result': 'none',
+}
+
 
 @batch_bp.route('', methods=['POST'])
 @jwt_required()
@@ -21,30 +183,22 @@ def create_batch():
     """
     try:
         # 1. Get current user information
-        current_user_id = get_jwt_identity()
+        # One get_jwt(): identity and role both come from the decoded claims
         jwt_claims = get_jwt()
+        current_user_id = int(jwt_claims['sub'])
         user_role = jwt_claims.get('role')
         
         # 2. Permission verification - only producer can create batches
         if user_role != 'producer':
-            return jsonify({
-                'error': 'Access denied',
-                'message': 'Only producers can create batches'
-            }), 403
+            return error_response(*_ERR_PRODUCERS_ONLY)
         
-        # 3. Get request data
-        data = request.get_json()
+        # 3. Get request data (only parsed once the role check has passed)
+        data = request.get_json(silent=True, cache=False)
         if not data:
-            return jsonify({
-                'error': 'Invalid request',
-                'message': 'Request body is required'
-            }), 400
+            return error_response(*_ERR_BODY_REQUIRED)
         
         if 'metadata' not in data:
-            return jsonify({
-                'error': 'Invalid request',
-                'message': 'metadata is required'
-            }), 400
+            return error_response(*_ERR_METADATA_REQUIRED)
         
         metadata = data['metadata']
         
@@ -59,8 +213,8 @@ def create_batch():
             }), 400
         
         # 5. If there are warnings, record the log (optional)
-        if validation_result['warnings']:
-            print(f"⚠️ Batch creation warnings: {validation_result['warnings']}")
+        if validation_result['warnings'] and logger.isEnabledFor(logging.WARNING):
+            logger.warning("⚠️ Batch creation warnings: %s", validation_result['warnings'])
         
         # 6. Automatically generate batch number (if not provided)
         if not metadata.get('batchNumber'):
@@ -70,19 +224,14 @@ def create_batch():
         blockchain_tx = None
         blockchain_owner = None
         
-        print(f"Creating batch on blockchain: {metadata['batchNumber']}")
+        logger.info("Creating batch on blockchain: %s", metadata['batchNumber'])
         
         # Connect to blockchain
-        network_config = get_network_config('testnet')
-        w3 = Web3(Web3.HTTPProvider(network_config['rpc_url']))
-        
-        if not w3.is_connected():
-            raise Exception("Failed to connect to blockchain network")
+        # No is_connected() probe: a dead endpoint makes the first real call raise
+        w3 = get_w3()
         
         # Get contract instance
-        batch_address = get_contract_address('BatchRegistry', 'testnet')
-        batch_abi = get_contract_abi('BatchRegistry')
-        contract = w3.eth.contract(address=batch_address, abi=batch_abi)
+        contract = get_contract('BatchRegistry')
         
         # Prepare contract parameters
         batch_number = metadata['batchNumber']
@@ -96,7 +245,6 @@ def create_batch():
         expiry_date = convert_date_for_contract(metadata.get('expiryDate'))
         
         # Get private key
-        from deploy_config import DEVELOPMENT_PRIVATE_KEYS
         private_key = DEVELOPMENT_PRIVATE_KEYS.get('owner')
         
         if not private_key:
@@ -106,49 +254,72 @@ def create_batch():
         account = w3.eth.account.from_key(private_key)
         blockchain_owner = account.address  # Save blockchain owner address
         
-        # Build transaction
-        transaction = contract.functions.createBatch(
-            batch_number,
-            product_name,
-            origin,
-            quantity,
-            unit,
-            harvest_date,
-            expiry_date
-        ).build_transaction({
+        # Build transaction. Calldata comes from the precomputed createBatch encoder
+        # (selector + eth_abi types bound once), skipping web3's per-call ABI lookup and
+        # validation; chainId is from config and the nonce from the local counter, so
+        # nothing here needs an RPC round trip (with NONCE_CACHE; otherwise one for the nonce)
+        transaction = {
+            'to': contract.address,
             'from': account.address,
-            'nonce': w3.eth.get_transaction_count(account.address),
+            'value': 0,
             'gas': 500000,
             'gasPrice': w3.to_wei('20', 'gwei'),
-        })
-        
-        # Sign and send transaction
-        signed_txn = w3.eth.account.sign_transaction(transaction, private_key)
-        tx_hash = w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+            'chainId': get_network_config('testnet').get('chain_id') or w3.eth.chain_id,
+            'data': FAST_ENCODERS['createBatch'](
+                batch_number,
+                product_name,
+                origin,
+                quantity,
+                unit,
+                harvest_date,
+                expiry_date
+            ),
+        }
         
-        print(f"Transaction sent: {tx_hash.hex()}")
+        # Sign and send transaction. The nonce is reserved last; if anything fails before
+        # the node accepts it, the counter re-syncs so no gap is left behind
+        transaction['nonce'] = next_nonce(w3, account.address, 'testnet',
+                                          cached=current_app.config.get('NONCE_CACHE', True))
+        try:
+            signed_txn = w3.eth.account.sign_transaction(transaction, private_key)
+            tx_hash = w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+        except Exception:
+            reset_nonce(account.address, 'testnet')
+            raise
+        
+        logger.info("Transaction sent: %s", tx_hash.hex())
+        
+        # Async mode: store the batch now and confirm the receipt in the background,
+        # so this worker isn't held for a block time (or the full receipt timeout)
+        if current_app.config.get('ASYNC_TX_CONFIRM'):
+            batch = Batch.insert_from_dict({'metadata': metadata}, owner_id=current_user_id)
+            db.session.commit()
+            _TX_POOL.submit(_confirm_batch_tx, current_app._get_current_object(), batch.id, tx_hash, w3)
+            return jsonify({
+                'batchId': batch.id,
+                'message': 'Batch submitted; blockchainTx is set on GET /batches/<id> once mined',
+                'status': batch.status,
+                'batchNumber': batch.batch_number,
+                'transactionHash': tx_hash.hex(),
+                'owner': blockchain_owner
+            }), 202
         
         # Wait for transaction confirmation
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        receipt = wait_for_receipt(w3, tx_hash, 'testnet')
         
         if receipt.status != 1:
             raise Exception("Blockchain transaction failed")
         
         blockchain_tx = tx_hash.hex()
-        print(f"✅ Batch created on blockchain successfully: {blockchain_tx}")
-        
-        # 8. Only create batch to database after blockchain success
-        batch = Batch.from_dict({'metadata': metadata}, owner_id=int(current_user_id))
+        logger.info("✅ Batch created on blockchain successfully: %s", blockchain_tx)
         
-        # Save blockchain transaction hash
-        batch.blockchain_tx = blockchain_tx
-        
-        # 9. Save to database
-        db.session.add(batch)
-        db.session.commit()
+        # 8. Only create batch to database after blockchain success, with its
+        # blockchain transaction hash. 9. One INSERT ... RETURNING gives the response
+        # the new row's id/status/batch number, with no ORM object or refresh SELECT
+        batch = Batch.insert_from_dict({'metadata': metadata}, owner_id=current_user_id,
+                                       blockchain_tx=blockchain_tx)
         
         # 10. Build complete response data - include all necessary fields
-        import time
         current_timestamp = int(time.time())
         
         # Ensure metadata contains timestamp
@@ -158,16 +329,13 @@ def create_batch():
             metadata['timestamp'] = current_timestamp
         
         response_data = {
+            **_CREATE_BATCH_RESPONSE,
             'batchId': batch.id,
-            'message': 'Batch created successfully',
             'status': batch.status,
             'batchNumber': batch.batch_number,
             
             # Add complete batch information
-            'exists': True,
-            'fileUrl': getattr(batch, 'file_url', 'none'),
-            'result': getattr(batch, 'result', 'none'),
-            'inspections': getattr(batch, 'inspections', []),
+            'inspections': [],   # a new batch has none; avoids loading the collection
             'timestamp': current_timestamp,
             
             # Complete metadata
@@ -196,6 +364,7 @@ def create_batch():
         if validation_result['warnings']:
             response_data['warnings'] = validation_result['warnings']
         
+        db.session.commit()
         return jsonify(response_data), 201
         
     except ValueError as e:
@@ -205,15 +374,58 @@ def create_batch():
             'message': str(e)
         }), 400
         
+    except _RPC_CONNECTION_ERRORS as e:
+        # A dead node surfaces on the first real RPC (nonce lookup or send)
+        db.session.rollback()
+        logger.error("❌ Batch creation failed: %s", e)
+        return jsonify({
+            'error': 'Failed to create batch',
+            'message': 'Blockchain or database operation failed',
+            'details': f"Failed to connect to blockchain network: {get_network_config('testnet')['rpc_url']}"
+        }), 500
+        
     except Exception as e:
         db.session.rollback()
-        print(f"❌ Batch creation failed: {str(e)}")
+        logger.error("❌ Batch creation failed: %s", e)
         return jsonify({
             'error': 'Failed to create batch',
             'message': 'Blockchain or database operation failed',
             'details': str(e)
         }), 500
         
+def _dash_date_format(value):
+    """The one strptime format for a non-ISO dash date, e.g. unpadded 2025-1-5"""
+    if 'T' in value:
+        return '%Y-%m-%dT%H:%M:%S'
+    if ' ' in value:
+        return '%Y-%m-%d %H:%M:%S'
+    return '%Y-%m-%d'
+
+
+def parse_date_string(value):
+    """
+    datetime for the date formats the frontend sends, or None.
+
+    Each shape has exactly one parse: ISO via fromisoformat (C), other dash dates via a
+    single strptime, and slash dates split as day/month/year, or month/day/year when
+    DATE_SLASH_DAY_FIRST is off.
+    """
+    try:
+        if '/' in value:
+            first, second, year = value.split('/')
+            if current_app.config.get('DATE_SLASH_DAY_FIRST', True):
+                day, month = first, second
+            else:
+                month, day = first, second
+            return datetime(int(year), int(month), int(day))
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return datetime.strptime(value, _dash_date_format(value))
+    except ValueError:
+        return None
+
+
 def convert_date_for_contract(date_str):
     """
     Convert date to timestamp format required by the contract
@@ -225,24 +437,9 @@ def convert_date_for_contract(date_str):
         
         # If it is a string date format, convert to timestamp
         if isinstance(date_str, str):
-            # Try to parse common date formats
-            from datetime import datetime
-            
-            # Try different date formats
-            date_formats = [
-                '%Y-%m-%d',
-                '%d/%m/%Y', 
-                '%m/%d/%Y',
-                '%Y-%m-%dT%H:%M:%S',
-                '%Y-%m-%d %H:%M:%S'
-            ]
-            
-            for fmt in date_formats:
-                try:
-                    dt = datetime.strptime(date_str, fmt)
-                    return int(dt.timestamp())
-                except ValueError:
-                    continue
+            dt = parse_date_string(date_str)
+            if dt:
+                return int(dt.timestamp())
         
         # If it is already a timestamp, return directly
         if isinstance(date_str, (int, float)):
@@ -252,44 +449,211 @@ def convert_date_for_contract(date_str):
         return int(time.time())
         
     except Exception as e:
-        print(f"Date conversion error: {e}, using current timestamp")
+        logger.warning("Date conversion error: %s, using current timestamp", e)
         return int(time.time())
 
 
+def conditional_json(payload):
+    """
+    jsonify(payload) with an ETag of the body, answered as 304 when the client's
+    If-None-Match already has it. Cache-Control: READ_CACHE_MAX_AGE seconds of
+    freshness, or no-cache (revalidate every time) when it is 0, the default.
+
+    The ETag hashes the finished body, so a 304 has still run every query and the
+    serialization: it only saves the transfer. Only READ_CACHE_MAX_AGE spares the
+    server work, by keeping clients from asking at all.
+    """
+    response = jsonify(payload)
+    response.add_etag()
+    max_age = current_app.config.get('READ_CACHE_MAX_AGE', 0)
+    if max_age:
+        response.cache_control.max_age = max_age
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+# Batch columns Batch.to_dict() reads, plus owner_id (read by ownership checks on the
+# same identity-mapped instance); get_batch loads only these
+_DETAIL_COLUMNS = (
+    Batch.product_name, Batch.origin, Batch.quantity, Batch.unit, Batch.created_at,
+    Batch.total_weight_kg, Batch.harvest_date, Batch.expiry_date, Batch.batch_number,
+    Batch.organic, Batch.import_product, Batch.status, Batch.blockchain_tx, Batch.owner_id,
+)
+
+
 @batch_bp.route('/<int:batch_id>', methods=['GET'])
 def get_batch(batch_id):
     """
     Query batch details
     GET /batches/{id}
     """
+    # 1. Query batch (only the columns to_dict() reads)
+    batch = db.session.get(Batch, batch_id, options=[load_only(*_DETAIL_COLUMNS)])
+    
+    if not batch:
+        return jsonify({
+            'error': 'Batch not found',
+            'message': f'No batch found with ID {batch_id}'
+        }), 404
+    
+    # 2. Get batch data
+    batch_data = batch.to_dict()
+    
+    # 3. Add status display information (using BatchService)
+    status_info = service_status_info(batch.status)
+    batch_data['statusInfo'] = status_info
+    
+    # 4. Add batch summary information (using BatchService)
+    summary = BatchService.calculate_batch_summary(batch_data['metadata'])
+    batch_data['summary'] = summary
+    
+    return conditional_json(batch_data)
+
+
+# Batch columns build_batch_list_item() reads; list_batches selects only these
+_LIST_COLUMNS = (
+    Batch.id, Batch.blockchain_tx, Batch.batch_number, Batch.product_name, Batch.origin,
+    Batch.quantity, Batch.unit, Batch.harvest_ts, Batch.expiry_ts, Batch.created_ts,
+    Batch.organic, Batch.import_product, Batch.total_weight_kg, Batch.status,
+)
+_LIST_ROW = attrgetter(*(column.key for column in _LIST_COLUMNS))
+
+
+def build_batch_list_item(batch, latest_inspection):
+    """One /batches entry (matching blockchain format) for a _LIST_COLUMNS row and its newest inspection"""
+    # All columns in one C-level attrgetter call instead of an attribute lookup per use
+    (batch_id, blockchain_tx, batch_number, product_name, origin, quantity, unit,
+     harvest_ts, expiry_ts, created_ts, organic, import_product, total_weight_kg,
+     status) = _LIST_ROW(batch)
+
+    # Get inspection data for this batch (latest record only, if any)
+    result = 'none'
+    file_url = 'none'
+    inspections_list = []
+
     try:
-        # 1. Query batch
-        batch = Batch.query.get(batch_id)
-        
-        if not batch:
-            return jsonify({
-                'error': 'Batch not found',
-                'message': f'No batch found with ID {batch_id}'
-            }), 404
-        
-        # 2. Get batch data
-        batch_data = batch.to_dict()
-        
-        # 3. Add status display information (using BatchService)
-        status_info = BatchService.get_status_display_info(batch.status)
-        batch_data['statusInfo'] = status_info
-        
-        # 4. Add batch summary information (using BatchService)
-        summary = BatchService.calculate_batch_summary(batch_data['metadata'])
-        batch_data['summary'] = summary
-        
-        return jsonify(batch_data), 200
-        
+        if latest_inspection:
+            inspection = latest_inspection
+            result = inspection.result
+            file_url = inspection.file_url or 'none'
+
+            # Get inspector info
+            inspector = inspection.inspector
+            inspector_id = inspector.email if inspector else str(inspection.inspector_id)
+
+            # Inspections list (matching blockchain format)
+            inspections_list.append({
+                'batchId': batch_id,
+                'blockchainTx': inspection.blockchain_tx,
+                'fileUrl': file_url,
+                'inspDate': _epoch(inspection.insp_date, utc=True),
+                'inspId': inspection.id,
+                'inspectorId': inspector_id,
+                'notes': inspection.notes or 'No notes',
+                'result': result
+            })
+
     except Exception as e:
-        return jsonify({
-            'error': 'Internal server error',
-            'message': 'Failed to retrieve batch'
-        }), 500
+        # Keep default values if inspection fetch fails
+        result = 'none'
+        file_url = 'none'
+
+    # Convert database data to frontend format (matching blockchain format exactly)
+    return {
+        'batchId': batch_id,
+        'blockchainTx': blockchain_tx,
+        'inspections': inspections_list,
+        'metadata': {
+            'batchNumber': batch_number,
+            'productName': product_name,
+            'origin': origin,
+            'quantity': str(quantity),
+            'unit': unit,
+            'harvestDate': harvest_ts or 0,   # 🎯 Timestamp format (stored precomputed), matching blockchain
+            'expiryDate': expiry_ts or 0,     # 🎯 Timestamp format (stored precomputed), matching blockchain
+            'createdAt': created_ts,
+            'organic': organic,
+            'import': import_product,
+            'totalWeightKg': total_weight_kg or 0,
+        },
+        'status': status,  # 🎯 Read status from database
+        'owner': '',       # Batch keeps no owner address; the chain's owner isn't stored
+        'timestamp': created_ts,
+        'exists': True,
+        'result': result,
+        'fileUrl': file_url,
+        # Add status display info
+        'statusInfo': get_status_display_info(status),
+    }
+
+
+def iter_batch_list_items(batches, latest_inspections):
+    """build_batch_list_item() per batch, skipping rows that fail to convert"""
+    for batch in batches:
+        try:
+            yield build_batch_list_item(batch, latest_inspections.get(batch.id))
+        except Exception as e:
+            continue
+
+
+# Pages with a larger per_page are streamed by list_batches, STREAM_CHUNK rows at a time
+STREAM_MIN_BATCHES = 100
+STREAM_CHUNK = 100
+
+
+def list_pagination_info(total, query, page, per_page):
+    """
+    The pagination block for a list_batches page.
+
+    total: the page's windowed COUNT(*), or None when the page came back empty;
+    past the last page there is no row to carry it, so query (unpaged) counts.
+    """
+    if total is None:
+        total = query.with_entities(func.count(Batch.id)).scalar() if page > 1 else 0
+    return {
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': -(-total // per_page)
+    }
+
+
+def stream_batch_list(page_query, query, page, per_page):
+    """Yield {"batches": [...], "pagination": {...}} one encoded batch at a time"""
+    dumps = current_app.json.dumps
+    total = None
+    first = True
+    yield '{"batches":['
+    for chunk in db.session.execute(page_query.statement).yield_per(STREAM_CHUNK).partitions():
+        if total is None:
+            total = chunk[0].total
+        latest_inspections = get_latest_inspections([row.id for row in chunk])
+        for item in iter_batch_list_items(chunk, latest_inspections):
+            yield ('' if first else ',') + dumps(item)
+            first = False
+    yield '],"pagination":' + dumps(list_pagination_info(total, query, page, per_page)) + '}'
+
+
+def get_latest_inspections(batch_ids):
+    """
+    {batch_id: newest Inspection} for the given batches, in one query.
+
+    ROW_NUMBER() per batch (newest created_at first, id breaking ties) keeps only
+    one row per batch instead of loading every batch's full history.
+    """
+    if not batch_ids:
+        return {}
+    rank = func.row_number().over(
+        partition_by=Inspection.batch_id,
+        order_by=(Inspection.created_at.desc(), Inspection.id.desc()),
+    ).label('rank')
+    ranked = select(Inspection, rank).where(Inspection.batch_id.in_(batch_ids)).subquery()
+    latest = aliased(Inspection, ranked)
+    rows = db.session.scalars(
+        select(latest).where(ranked.c.rank == 1).options(joinedload(latest.inspector))
+    )
+    return {inspection.batch_id: inspection for inspection in rows}
 
 
 @batch_bp.route('', methods=['GET'])
@@ -298,139 +662,51 @@ def list_batches():
     Query batch list - Read from database (matching blockchain format)
     GET /batches
     """
+    # Get query parameters; non-integers are rejected, out-of-range values clamped
+    # (per_page to MAX_PER_PAGE) before anything reaches the database
     try:
-        # Get query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
-        status = request.args.get('status')
-        
-        # 🔄 Query batch from database
-        query = Batch.query
-        
-        # Filter by status if specified
-        if status:
+        page = int(request.args.get('page', 1))
+        per_page = int(request.args.get('per_page', 10))
+    except ValueError:
+        return error_response(*_ERR_BAD_PAGING)
+    status = request.args.get('status')
+    
+    page = max(page, 1)
+    per_page = min(max(per_page, 1), current_app.config.get('MAX_PER_PAGE', 100))
+    
+    # 🔄 Query batch from database: only the columns the list view reads, no ORM
+    # objects, and the filtered total as a window COUNT(*) on every row instead of
+    # a second query. Only the latest inspection per batch is fetched below
+    # (full history: GET /batches/<id>/inspections)
+    query = db.session.query(*_LIST_COLUMNS, func.count().over().label('total'))
+    
+    # Filter by status if specified
+    if status:
+        # Unknown names can't be bound to the integer column; they match nothing
+        if status.lower() in _VALID_STATUSES:
             query = query.filter(Batch.status == status)
-        
-        # 🎯 Sort by batch ID (ascending: 1, 2, 3...)
-        query = query.order_by(Batch.id.asc())
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-        batches_db = pagination.items
-        
-        # Get all batch data
-        batch_list = []
-        for batch in batches_db:
-            try:
-                # Convert date to timestamp (matching blockchain format)
-                harvest_timestamp = 0
-                expiry_timestamp = 0
-                
-                if batch.harvest_date:
-                    from datetime import datetime, time
-                    harvest_datetime = datetime.combine(batch.harvest_date, time())
-                    harvest_timestamp = int(harvest_datetime.timestamp())
-                
-                if batch.expiry_date:
-                    from datetime import datetime, time
-                    expiry_datetime = datetime.combine(batch.expiry_date, time())
-                    expiry_timestamp = int(expiry_datetime.timestamp())
-                
-                # Get inspection data for this batch
-                result = 'none'
-                file_url = 'none'
-                inspections_list = []
-                
-                try:
-                    # Get all inspection records for this batch
-                    inspections = Inspection.query.filter_by(batch_id=batch.id)\
-                                                .order_by(Inspection.created_at.desc())\
-                                                .all()
-                    
-                    if inspections:
-                        # Get latest inspection details
-                        latest_inspection = inspections[0]
-                        result = latest_inspection.result
-                        file_url = latest_inspection.file_url if latest_inspection.file_url else 'none'
-                        
-                        # Build inspections list (matching blockchain format)
-                        for inspection in inspections:
-                            # Get inspector info
-                            inspector = User.query.get(inspection.inspector_id)
-                            inspector_id = inspector.email if inspector else str(inspection.inspector_id)
-                            
-                            inspections_list.append({
-                                'batchId': batch.id,
-                                'blockchainTx': inspection.blockchain_tx,
-                                'fileUrl': inspection.file_url if inspection.file_url else 'none',
-                                'inspDate': int(inspection.insp_date.timestamp()),
-                                'inspId': inspection.id,
-                                'inspectorId': inspector_id,
-                                'notes': inspection.notes if inspection.notes else 'No notes',
-                                'result': inspection.result
-                            })
-                
-                except Exception as e:
-                    # Keep default values if inspection fetch fails
-                    pass
-                
-                # Convert database data to frontend format (matching blockchain format exactly)
-                batch_dict = {
-                    'batchId': batch.id,
-                    'blockchainTx': batch.blockchain_tx,
-                    'inspections': inspections_list,
-                    'metadata': {
-                        'batchNumber': batch.batch_number,
-                        'productName': batch.product_name,
-                        'origin': batch.origin,
-                        'quantity': str(batch.quantity),
-                        'unit': batch.unit,
-                        'harvestDate': harvest_timestamp,  # 🎯 Timestamp format, matching blockchain
-                        'expiryDate': expiry_timestamp,    # 🎯 Timestamp format, matching blockchain
-                        'createdAt': int(batch.created_at.timestamp()),
-                        'organic': batch.organic,
-                        'import': batch.import_product,
-                        'totalWeightKg': batch.total_weight_kg or 0,
-                    },
-                    'status': batch.status,  # 🎯 Read status from database
-                    'owner': getattr(batch, 'owner_address', ''),
-                    'timestamp': int(batch.created_at.timestamp()),
-                    'exists': True,
-                    'result': result,
-                    'fileUrl': file_url
-                }
-                
-                # Add status display info
-                batch_dict['statusInfo'] = get_status_display_info(batch.status)
-                
-                batch_list.append(batch_dict)
-                
-            except Exception as e:
-                continue
-        
-        # Filter by status if specified (after building the list)
-        if status:
-            batch_list = [b for b in batch_list if b['status'] == status]
-        
-        # Simple pagination
-        start_index = (page - 1) * per_page
-        end_index = start_index + per_page
-        paginated_batches = batch_list[start_index:end_index]
-        
-        return jsonify({
-            'batches': paginated_batches,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': len(batch_list),
-                'pages': (len(batch_list) + per_page - 1) // per_page
-            }
-        }), 200
-        
-    except Exception as e:
-        print(f"Error in list_batches: {e}")
-        return jsonify({
-            'error': 'Internal server error',
-            'message': f'Failed to retrieve batches: {str(e)}'
-        }), 500
+        else:
+            query = query.filter(false())
+    
+    # 🎯 Sort by batch ID (ascending: 1, 2, 3...)
+    page_query = query.order_by(Batch.id.asc()).limit(per_page).offset((page - 1) * per_page)
+    
+    # Large pages are streamed: rows are read in chunks and each batch is encoded
+    # and sent as soon as its chunk's latest inspections are in
+    if per_page > STREAM_MIN_BATCHES:
+        return Response(stream_with_context(
+            stream_batch_list(page_query, query, page, per_page)), mimetype='application/json'), 200
+    
+    rows = page_query.all()
+    latest_inspections = get_latest_inspections([row.id for row in rows])
+    
+    items = iter_batch_list_items(rows, latest_inspections)
+    pagination_info = list_pagination_info(rows[0].total if rows else None, query, page, per_page)
+    
+    return conditional_json({
+        'batches': list(items),
+        'pagination': pagination_info
+    })
 
 def convert_date_for_display(date_value):
     try:
@@ -439,23 +715,9 @@ def convert_date_for_display(date_value):
         
         # If it is a string date format, convert to timestamp
         if isinstance(date_value, str):
-            from datetime import datetime
-            
-            # Try different date formats
-            date_formats = [
-                '%Y-%m-%d',
-                '%d/%m/%Y', 
-                '%m/%d/%Y',
-                '%Y-%m-%dT%H:%M:%S',
-                '%Y-%m-%d %H:%M:%S'
-            ]
-            
-            for fmt in date_formats:
-                try:
-                    dt = datetime.strptime(date_value, fmt)
-                    return int(dt.timestamp())
-                except ValueError:
-                    continue
+            dt = parse_date_string(date_value)
+            if dt:
+                return int(dt.timestamp())
         
         # If it is already a timestamp, return directly
         if isinstance(date_value, (int, float)):
@@ -465,11 +727,23 @@ def convert_date_for_display(date_value):
         return None
         
     except Exception as e:
-        print(f"Date conversion error: {e}")
+        logger.warning("Date conversion error: %s", e)
         return None
 
 
 
+def _invert_transitions(transitions):
+    """{status: allowed next statuses} -> {status: statuses it may be reached from}"""
+    prev = {}
+    for source, targets in transitions.items():
+        for target in targets:
+            prev.setdefault(target, []).append(source)
+    return {target: tuple(sources) for target, sources in prev.items()}
+
+
+_ALLOWED_PREV = _invert_transitions(BatchService.STATUS_TRANSITIONS)
+
+
 @batch_bp.route('/<int:batch_id>/status', methods=['PUT'])
 @jwt_required()
 def update_batch_status(batch_id):
@@ -479,12 +753,42 @@ def update_batch_status(batch_id):
     """
     try:
         # 1. Get current user information
-        current_user_id = get_jwt_identity()
+        # One get_jwt(): identity and role both come from the decoded claims
         jwt_claims = get_jwt()
+        current_user_id = int(jwt_claims['sub'])
         user_role = jwt_claims.get('role')
         
+        data = request.get_json(silent=True, cache=False)
+        new_status = data.get('status') if isinstance(data, dict) else None
+        if new_status is not None and not isinstance(new_status, str):
+            # e.g. a list or dict: unhashable, and never a valid status
+            return jsonify({
+                'error': 'Invalid status transition',
+                'message': BatchService.validate_status_transition(None, new_status)['error']
+            }), 400
+        
+        # Fast path: one conditional UPDATE does the existence, ownership and transition
+        # checks. It applies when the target status has a single allowed predecessor
+        # (true for every transition today), which is then also the old status
+        prev_statuses = _ALLOWED_PREV.get(new_status, ())
+        if len(prev_statuses) == 1:
+            stmt = update(Batch).where(Batch.id == batch_id, Batch.status == prev_statuses[0])
+            if user_role == 'producer':
+                stmt = stmt.where(Batch.owner_id == current_user_id)
+            if db.session.execute(stmt.values(status=new_status).returning(Batch.id)).first():
+                db.session.commit()
+                return jsonify({
+                    'message': 'Batch status updated successfully',
+                    'batchId': batch_id,
+                    'oldStatus': prev_statuses[0],
+                    'newStatus': new_status,
+                    'statusInfo': service_status_info(new_status)
+                }), 200
+            db.session.rollback()   # release the write lock the no-op UPDATE took
+        
+        # Nothing updated: the checks below tell 404 / 403 / 400 apart (in that order)
         # 2. Query batch
-        batch = Batch.query.get(batch_id)
+        batch = db.session.get(Batch, batch_id, options=[lazyload(Batch.inspections)])
         if not batch:
             return jsonify({
                 'error': 'Batch not found',
@@ -492,21 +796,12 @@ def update_batch_status(batch_id):
             }), 404
         
         # 3. Permission verification
-        if user_role == 'producer' and batch.owner_id != int(current_user_id):
-            return jsonify({
-                'error': 'Access denied',
-                'message': 'You can only update your own batches'
-            }), 403
+        if user_role == 'producer' and batch.owner_id != current_user_id:
+            return error_response(*_ERR_OWN_BATCHES_ONLY)
         
         # 4. Get new status
-        data = request.get_json()
         if not data or 'status' not in data:
-            return jsonify({
-                'error': 'Invalid request',
-                'message': 'status is required'
-            }), 400
-        
-        new_status = data['status']
+            return error_response(*_ERR_STATUS_REQUIRED)
         
         # 5. Use BatchService to validate status transition
         transition_result = BatchService.validate_status_transition(batch.status, new_status)
@@ -523,7 +818,7 @@ def update_batch_status(batch_id):
         db.session.commit()
         
         # 7. Get status display information
-        status_info = BatchService.get_status_display_info(new_status)
+        status_info = service_status_info(new_status)
         
         return jsonify({
             'message': 'Batch status updated successfully',
@@ -535,75 +830,87 @@ def update_batch_status(batch_id):
         
     except Exception as e:
         db.session.rollback()
-        return jsonify({
-            'error': 'Internal server error',
-            'message': 'Failed to update batch status'
-        }), 500
+        return error_response(*_ERR_UPDATE_FAILED)
         
 
+# Contract enum codes -> names, and per-status display info; built once, returned shared
+_CONTRACT_STATUS = {
+    0: 'pending',     # PENDING
+    1: 'inspected',   # INSPECTED  
+    2: 'approved',    # APPROVED
+    3: 'rejected'     # REJECTED
+}
+
+_STATUS_DISPLAY_INFO = {
+    'pending': {
+        'color': 'orange',
+        'display': 'pending',
+        'status': 'pending'
+    },
+    'inspected': {
+        'color': 'blue', 
+        'display': 'inspected',
+        'status': 'inspected'
+    },
+    'approved': {
+        'color': 'green',
+        'display': 'approved', 
+        'status': 'approved'
+    },
+    'rejected': {
+        'color': 'red',
+        'display': 'rejected',
+        'status': 'rejected'
+    }
+}
+
+_INSPECTION_RESULT = {
+    0: 'pending',
+    1: 'passed', 
+    2: 'failed',
+    3: 'needs_recheck'
+}
+
+
 def convert_contract_status_to_string(status_code):
     """Convert contract status code to string"""
-    status_mapping = {
-        0: 'pending',     # PENDING
-        1: 'inspected',   # INSPECTED  
-        2: 'approved',    # APPROVED
-        3: 'rejected'     # REJECTED
-    }
-    return status_mapping.get(status_code, 'pending')
+    return _CONTRACT_STATUS.get(status_code, 'pending')
 
 
 def get_status_display_info(status):
-    """Get status display information"""
-    status_info = {
-        'pending': {
-            'color': 'orange',
-            'display': 'pending',
-            'status': 'pending'
-        },
-        'inspected': {
-            'color': 'blue', 
-            'display': 'inspected',
-            'status': 'inspected'
-        },
-        'approved': {
-            'color': 'green',
-            'display': 'approved', 
-            'status': 'approved'
-        },
-        'rejected': {
-            'color': 'red',
-            'display': 'rejected',
-            'status': 'rejected'
-        }
-    }
-    return status_info.get(status, status_info['pending'])
+    """Get status display information (shared dict, don't mutate)"""
+    return _STATUS_DISPLAY_INFO.get(status, _STATUS_DISPLAY_INFO['pending'])
+
+
+# BatchService's display info per known status, computed once at import
+_VALID_STATUSES = frozenset(BatchService.VALID_STATUSES)
+_SERVICE_STATUS_INFO = {s: BatchService.get_status_display_info(s) for s in _VALID_STATUSES}
+
+
+def service_status_info(status):
+    """BatchService.get_status_display_info(status), precomputed for known statuses (shared dict)"""
+    info = _SERVICE_STATUS_INFO.get(status)
+    return info if info is not None else BatchService.get_status_display_info(status)
+
+
 def convert_inspection_result_to_string(result_code):
     """Convert inspection result code to string"""
-    result_mapping = {
-        0: 'pending',
-        1: 'passed', 
-        2: 'failed',
-        3: 'needs_recheck'
-    }
-    return result_mapping.get(result_code, 'none')
+    return _INSPECTION_RESULT.get(result_code, 'none')
 
 
 @batch_bp.route('/debug/compare/<int:batch_id>', methods=['GET'])
 def compare_batch_status(batch_id):
     """Compare batch status between database and blockchain"""
     try:
+        # Query blockchain on the RPC pool while the database is read here
+        contract = get_contract('BatchRegistry')
+        onchain = _RPC_POOL.submit(get_onchain_batch, contract, batch_id)
+        
         # Query database
-        batch = Batch.query.get(batch_id)
+        batch = db.session.get(Batch, batch_id, options=[lazyload(Batch.inspections)])
         db_status = batch.status if batch else "Not found"
         
-        # Query blockchain
-        network_config = get_network_config('testnet')
-        w3 = Web3(Web3.HTTPProvider(network_config['rpc_url']))
-        batch_address = get_contract_address('BatchRegistry', 'testnet')
-        batch_abi = get_contract_abi('BatchRegistry')
-        contract = w3.eth.contract(address=batch_address, abi=batch_abi)
-        
-        batch_data = contract.functions.getBatch(batch_id).call()
+        batch_data = onchain.result()
         blockchain_status = convert_contract_status_to_string(batch_data[8])
         
         return jsonify({
@@ -620,7 +927,6 @@ def compare_batch_status(batch_id):
 def check_inspector_auth():
     try:
         # Get current account address
-        from deploy_config import DEVELOPMENT_PRIVATE_KEYS
         private_key = DEVELOPMENT_PRIVATE_KEYS.get('inspector1')
         if not private_key:
             private_key = DEVELOPMENT_PRIVATE_KEYS.get('owner')
@@ -630,25 +936,22 @@ def check_inspector_auth():
         
         # Connect to blockchain
         network_config = get_network_config('testnet')
-        w3 = Web3(Web3.HTTPProvider(network_config['rpc_url']))
+        w3 = get_w3()
         account = w3.eth.account.from_key(private_key)
         
         # Check InspectionManager permission
-        inspection_address = get_contract_address('InspectionManager', 'testnet')
-        inspection_abi = get_contract_abi('InspectionManager')
-        inspection_contract = w3.eth.contract(address=inspection_address, abi=inspection_abi)
+        inspection_contract = get_contract('InspectionManager')
         
         # Check BatchRegistry permission
-        batch_address = get_contract_address('BatchRegistry', 'testnet')
-        batch_abi = get_contract_abi('BatchRegistry')
-        batch_contract = w3.eth.contract(address=batch_address, abi=batch_abi)
-        
-        # Get permission status
-        inspection_auth = inspection_contract.functions.isAuthorizedInspector(account.address).call()
-        batch_auth = batch_contract.functions.isAuthorizedInspector(account.address).call()
-        
-        # Get balance
-        balance = w3.eth.get_balance(account.address)
+        batch_contract = get_contract('BatchRegistry')
+        
+        # Get permission status and balance: three independent reads, sent as one
+        # JSON-RPC batch (a single HTTP round trip)
+        with w3.batch_requests() as rpc_batch:
+            rpc_batch.add(inspection_contract.functions.isAuthorizedInspector(account.address))
+            rpc_batch.add(batch_contract.functions.isAuthorizedInspector(account.address))
+            rpc_batch.add(w3.eth.get_balance(account.address))
+            inspection_auth, batch_auth, balance = rpc_batch.execute()
         balance_eth = w3.from_wei(balance, 'ether')
         
         return jsonify({
@@ -659,8 +962,8 @@ def check_inspector_auth():
             'balance_wei': str(balance),
             'network': network_config['name'],
             'contracts': {
-                'inspection_manager': inspection_address,
-                'batch_registry': batch_address
+                'inspection_manager': inspection_contract.address,
+                'batch_registry': batch_contract.address
             }
         })
         
@@ -6,12 +6,14 @@ Handles inspection-related HTTP requests
 
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import false, select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload, lazyload, load_only
 from datetime import datetime
 import logging
 
 from models.batch import Batch
-from models.inspection import Inspection
+from models.inspection import Inspection, InspectionResult
 from models.user import User
 from extensions import db
 from web3 import Web3
@@ -19,6 +21,8 @@ from deploy_config import (
     get_network_config, 
     get_contract_address, 
     get_contract_abi, 
+    get_provider,
+    wait_for_receipt,
     DEVELOPMENT_PRIVATE_KEYS 
 )
 
@@ -30,6 +34,8 @@ logger = logging.getLogger(__name__)
 # Create blueprint
 inspection_bp = Blueprint('inspection', __name__)
 
+_VALID_RESULTS = frozenset(r.name.lower() for r in InspectionResult)
+
 @inspection_bp.route('/batches/<int:batch_id>/inspection', methods=['POST'])
 @jwt_required()
 def submit_inspection(batch_id):
@@ -41,7 +47,7 @@ def submit_inspection(batch_id):
     try:
         # 1. User validation
         current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = db.session.get(User, int(current_user_id))
         
         if not current_user:
             return jsonify({'error': 'User not found'}), 401
@@ -50,7 +56,7 @@ def submit_inspection(batch_id):
             return jsonify({'error': 'Access denied. Only inspectors can submit inspection results'}), 403
         
         # 2. Batch validation
-        batch = Batch.query.get(batch_id)
+        batch = db.session.get(Batch, batch_id, options=[lazyload(Batch.inspections)])
         if not batch:
             return jsonify({'error': 'Batch not found'}), 404
         
@@ -107,7 +113,7 @@ def submit_inspection(batch_id):
         logger.info(f"   Chain ID: {network_config['chain_id']}")
         
         try:
-            w3 = Web3(Web3.HTTPProvider(network_config['rpc_url']))
+            w3 = Web3(get_provider('testnet'))
             logger.info(f"   Web3 instance created successfully")
         except Exception as web3_error:
             logger.error(f"❌ Web3 instance creation failed: {str(web3_error)}")
@@ -259,7 +265,7 @@ def submit_inspection(batch_id):
             
             # Wait for create transaction confirmation
             logger.info(f"⏳ Waiting for transaction confirmation (max 120 seconds)...")
-            create_receipt = w3.eth.wait_for_transaction_receipt(create_tx_hash, timeout=120)
+            create_receipt = wait_for_receipt(w3, create_tx_hash, 'testnet')
             
             # Detailed transaction receipt information
             logger.info(f"📄 Transaction receipt details:")
@@ -376,7 +382,7 @@ def submit_inspection(batch_id):
                 
                 # Wait for complete transaction confirmation
                 logger.info(f"⏳ Waiting for complete transaction confirmation (max 120 seconds)...")
-                complete_receipt = w3.eth.wait_for_transaction_receipt(complete_tx_hash, timeout=120)
+                complete_receipt = wait_for_receipt(w3, complete_tx_hash, 'testnet')
                 
                 # Detailed complete transaction receipt information
                 logger.info(f"📄 Complete transaction receipt details:")
@@ -531,13 +537,13 @@ def get_batch_inspections(batch_id):
     try:
         # Get current user
         current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = db.session.get(User, int(current_user_id))
         
         if not current_user:
             return jsonify({'error': 'User not found'}), 401
         
         # Verify batch exists
-        batch = Batch.query.get(batch_id)
+        batch = db.session.get(Batch, batch_id, options=[lazyload(Batch.inspections)])
         if not batch:
             return jsonify({'error': 'Batch not found'}), 404
         
@@ -545,13 +551,14 @@ def get_batch_inspections(batch_id):
         if current_user.role == 'producer' and batch.owner_id != current_user_id:
             return jsonify({'error': 'No permission to view inspection records for this batch'}), 403
         
-        # Get inspection records
-        inspections = Inspection.query.filter_by(batch_id=batch_id).order_by(Inspection.created_at.desc()).all()
+        # Get inspection records, inspectors joined in (no query per row)
+        inspections = (Inspection.query.options(joinedload(Inspection.inspector))
+                       .filter_by(batch_id=batch_id).order_by(Inspection.created_at.desc()).all())
         
         # Build response
         inspections_data = []
         for inspection in inspections:
-            inspector = User.query.get(inspection.inspector_id)
+            inspector = inspection.inspector
             inspections_data.append({
                 'id': inspection.id,
                 'inspector_id': inspection.inspector_id,
@@ -591,18 +598,18 @@ def get_inspection(inspection_id):
     try:
         # Get current user
         current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = db.session.get(User, int(current_user_id))
         
         if not current_user:
             return jsonify({'error': 'User not found'}), 401
         
         # Get inspection records
-        inspection = Inspection.query.get(inspection_id)
+        inspection = db.session.get(Inspection, inspection_id)
         if not inspection:
             return jsonify({'error': 'Inspection record not found'}), 404
         
         # Get associated batch
-        batch = Batch.query.get(inspection.batch_id)
+        batch = db.session.get(Batch, inspection.batch_id, options=[lazyload(Batch.inspections)])
         if not batch:
             return jsonify({'error': 'Associated batch not found'}), 404
         
@@ -611,7 +618,7 @@ def get_inspection(inspection_id):
             return jsonify({'error': 'No permission to view this inspection record'}), 403
         
         # Get inspector information
-        inspector = User.query.get(inspection.inspector_id)
+        inspector = db.session.get(User, inspection.inspector_id)
         
         # Build response
         response_data = {
@@ -674,7 +681,7 @@ def update_inspection(inspection_id):
     try:
         # Get current user
         current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = db.session.get(User, int(current_user_id))
         
         if not current_user:
             return jsonify({'error': 'User not found'}), 401
@@ -684,7 +691,7 @@ def update_inspection(inspection_id):
             return jsonify({'error': 'Only inspectors can update inspection records'}), 403
         
         # Get inspection records
-        inspection = Inspection.query.get(inspection_id)
+        inspection = db.session.get(Inspection, inspection_id)
         if not inspection:
             return jsonify({'error': 'Inspection record not found'}), 404
         
@@ -704,7 +711,7 @@ def update_inspection(inspection_id):
                 return jsonify({'error': f'Invalid inspection result: {data["result"]}'}), 400
         
         # Get associated batch
-        batch = Batch.query.get(inspection.batch_id)
+        batch = db.session.get(Batch, inspection.batch_id, options=[lazyload(Batch.inspections)])
         if not batch:
             return jsonify({'error': 'Associated batch not found'}), 404
         
@@ -789,7 +796,7 @@ def get_inspections():
     try:
         # Get current user
         current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = db.session.get(User, int(current_user_id))
         
         if not current_user:
             return jsonify({'error': 'User not found'}), 401
@@ -800,18 +807,27 @@ def get_inspections():
         result_filter = request.args.get('result')
         inspector_id = request.args.get('inspector_id', type=int)
         
-        # Build query
-        query = Inspection.query
+        # Build query; each row's inspector and batch (just the two columns read below,
+        # without its inspection history) come in the same SELECT instead of two per row
+        query = Inspection.query.options(
+            joinedload(Inspection.inspector),
+            joinedload(Inspection.batch).options(
+                load_only(Batch.batch_number, Batch.product_name), lazyload(Batch.inspections)),
+        )
         
         # Permission filter: producers can only view inspection records of their own batches
         if current_user.role == 'producer':
-            # Get user's batch ID list
-            user_batch_ids = [batch.id for batch in Batch.query.filter_by(owner_id=current_user_id).all()]
+            # Subquery of the user's batch IDs, so no batches are loaded to build the filter
+            user_batch_ids = select(Batch.id).where(Batch.owner_id == int(current_user_id))
             query = query.filter(Inspection.batch_id.in_(user_batch_ids))
         
         # Result filter
         if result_filter:
-            query = query.filter(Inspection.result == result_filter)
+            # Unknown names can't be bound to the integer column; they match nothing
+            if result_filter.lower() in _VALID_RESULTS:
+                query = query.filter(Inspection.result == result_filter)
+            else:
+                query = query.filter(false())
         
         # Inspector filter
         if inspector_id:
@@ -825,8 +841,8 @@ def get_inspections():
         # Build response
         inspections_data = []
         for inspection in inspections:
-            inspector = User.query.get(inspection.inspector_id)
-            batch = Batch.query.get(inspection.batch_id)
+            inspector = inspection.inspector
+            batch = inspection.batch
             
             inspections_data.append({
                 'id': inspection.id,
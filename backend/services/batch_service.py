@@ -1,6 +1,11 @@
 from datetime import datetime, date
 from typing import Dict, List, Optional, Any
 import re
+import secrets
+
+# YYYY-MM-DD, compiled once; matching strings are parsed with date.fromisoformat
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_DATE_FIELDS = ('harvestDate', 'expiryDate')
 
 class BatchService:
     """
@@ -35,17 +40,20 @@ class BatchService:
         errors = []
         warnings = []
         
+        # Each date is parsed once here and shared by the format and business-rule checks
+        dates, date_errors = BatchService._parse_dates(metadata)
+        
         # 1. Check required fields
         missing_fields = BatchService._check_required_fields(metadata)
         if missing_fields:
             errors.extend([f"Missing required field: {field}" for field in missing_fields])
         
         # 2. Check field formats
-        format_errors = BatchService._validate_field_formats(metadata)
+        format_errors = BatchService._validate_field_formats(metadata, dates, date_errors)
         errors.extend(format_errors)
         
         # 3. Check business rules
-        business_warnings = BatchService._validate_business_rules(metadata)
+        business_warnings = BatchService._validate_business_rules(metadata, dates)
         warnings.extend(business_warnings)
         
         return {
@@ -66,7 +74,8 @@ class BatchService:
         return missing_fields
     
     @staticmethod
-    def _validate_field_formats(metadata: Dict[str, Any]) -> List[str]:
+    def _validate_field_formats(metadata: Dict[str, Any], dates: Dict[str, date],
+                                date_errors: Dict[str, str]) -> List[str]:
         """Validate field formats"""
         errors = []
         
@@ -103,7 +112,7 @@ class BatchService:
                 errors.append("totalWeightKg must be integer")
         
         # Validate date format
-        errors.extend(BatchService._validate_dates(metadata))
+        errors.extend(BatchService._validate_dates(dates, date_errors))
         
         # Validate boolean values
         errors.extend(BatchService._validate_booleans(metadata))
@@ -111,50 +120,59 @@ class BatchService:
         return errors
     
     @staticmethod
-    def _validate_dates(metadata: Dict[str, Any]) -> List[str]:
-        """Validate date fields"""
-        errors = []
-        date_fields = ['harvestDate', 'expiryDate']
-        
-        for field in date_fields:
+    def _parse_dates(metadata: Dict[str, Any]):
+        """
+        Parse the date fields once.
+
+        Returns ({field: date} for the well-formed ones, {field: format error}).
+        """
+        dates = {}
+        errors = {}
+        for field in _DATE_FIELDS:
             date_str = metadata.get(field)
             if date_str:
+                # Validate date format YYYY-MM-DD
+                if not isinstance(date_str, str) or not _DATE_RE.match(date_str):
+                    errors[field] = f"{field} must be in YYYY-MM-DD format"
+                    continue
                 try:
-                    # Validate date format YYYY-MM-DD
-                    if not re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
-                        errors.append(f"{field} must be in YYYY-MM-DD format")
-                        continue
-                    
-                    parsed_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                    
-                    # Validate date reasonableness
-                    if field == 'harvestDate':
-                        # Harvest date cannot be in the future
-                        if parsed_date > date.today():
-                            errors.append("harvestDate cannot be in the future")
-                        # Harvest date cannot be too old
-                        elif parsed_date < date(2000, 1, 1):
-                            errors.append("harvestDate too old (before 2000)")
-                    
-                    elif field == 'expiryDate':
-                        # Expiry date must be in the future
-                        if parsed_date <= date.today():
-                            errors.append("expiryDate must be in the future")
-                
+                    dates[field] = date.fromisoformat(date_str)
                 except ValueError:
-                    errors.append(f"Invalid date format for {field}")
+                    errors[field] = f"Invalid date format for {field}"
+        return dates, errors
+    
+    @staticmethod
+    def _validate_dates(dates: Dict[str, date], date_errors: Dict[str, str]) -> List[str]:
+        """Validate date fields (already parsed by _parse_dates)"""
+        errors = []
+        today = date.today()
+        
+        for field in _DATE_FIELDS:
+            if field in date_errors:
+                errors.append(date_errors[field])
+            parsed_date = dates.get(field)
+            if parsed_date is None:
+                continue
+            
+            # Validate date reasonableness
+            if field == 'harvestDate':
+                # Harvest date cannot be in the future
+                if parsed_date > today:
+                    errors.append("harvestDate cannot be in the future")
+                # Harvest date cannot be too old
+                elif parsed_date < date(2000, 1, 1):
+                    errors.append("harvestDate too old (before 2000)")
+            
+            elif field == 'expiryDate':
+                # Expiry date must be in the future
+                if parsed_date <= today:
+                    errors.append("expiryDate must be in the future")
         
         # Validate date logical relationships
-        harvest_date = metadata.get('harvestDate')
-        expiry_date = metadata.get('expiryDate')
-        if harvest_date and expiry_date:
-            try:
-                harvest = datetime.strptime(harvest_date, '%Y-%m-%d').date()
-                expiry = datetime.strptime(expiry_date, '%Y-%m-%d').date()
-                if expiry <= harvest:
-                    errors.append("expiryDate must be after harvestDate")
-            except ValueError:
-                pass  # Format errors already checked above
+        harvest = dates.get('harvestDate')
+        expiry = dates.get('expiryDate')
+        if harvest and expiry and expiry <= harvest:
+            errors.append("expiryDate must be after harvestDate")
         
         return errors
     
@@ -172,25 +190,20 @@ class BatchService:
         return errors
     
     @staticmethod
-    def _validate_business_rules(metadata: Dict[str, Any]) -> List[str]:
+    def _validate_business_rules(metadata: Dict[str, Any], dates: Dict[str, date]) -> List[str]:
         """Validate business rules (returns warnings)"""
         warnings = []
         
         # Check shelf life reasonableness
-        harvest_date = metadata.get('harvestDate')
-        expiry_date = metadata.get('expiryDate')
-        if harvest_date and expiry_date:
-            try:
-                harvest = datetime.strptime(harvest_date, '%Y-%m-%d').date()
-                expiry = datetime.strptime(expiry_date, '%Y-%m-%d').date()
-                shelf_life = (expiry - harvest).days
-                
-                if shelf_life > 365:
-                    warnings.append("Shelf life over 1 year, please verify")
-                elif shelf_life < 1:
-                    warnings.append("Very short shelf life, please verify")
-            except ValueError:
-                pass
+        harvest = dates.get('harvestDate')
+        expiry = dates.get('expiryDate')
+        if harvest and expiry:
+            shelf_life = (expiry - harvest).days
+            
+            if shelf_life > 365:
+                warnings.append("Shelf life over 1 year, please verify")
+            elif shelf_life < 1:
+                warnings.append("Very short shelf life, please verify")
         
         # Check consistency between weight and quantity
         quantity = metadata.get('quantity')
@@ -239,13 +252,14 @@ class BatchService:
     @staticmethod
     def get_next_batch_number() -> str:
         """
-        Generate next batch number
+        Generate next batch number, without reading the batches table
         
         Returns:
-            str: Batch number format: BATCH-YYYYMMDDHHMMSS
+            str: Batch number format: BATCH-YYYYMMDDHHMMSS-xxxxxx (random hex suffix,
+            so POSTs within the same second don't collide on the unique column)
         """
         timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-        return f"BATCH-{timestamp}"
+        return f"BATCH-{timestamp}-{secrets.token_hex(3)}"
     
     @staticmethod
     def calculate_batch_summary(metadata: Dict[str, Any]) -> Dict[str, Any]:
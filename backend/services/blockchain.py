@@ -6,12 +6,14 @@ Implement Web3 integration and smart contract call logic
 
 import os
 import json
+import time
 import logging
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
 from web3 import Web3
 from web3.contract import Contract
 from web3.exceptions import Web3Exception, ContractLogicError
+from web3.middleware import Web3Middleware
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
 
@@ -22,9 +24,13 @@ from deploy_config import (
     get_network_config, 
     get_contract_address, 
     get_contract_abi,
+    get_provider,
+    compute_fees,
+    wait_for_receipt,
     BATCH_STATUS, 
     INSPECTION_RESULT,
-    DEFAULT_NETWORK
+    DEFAULT_NETWORK,
+    BLOCK_TAG_POLICY,
 )
 
 # Configure logging
@@ -43,6 +49,81 @@ class InsufficientFundsError(BlockchainError):
     """Insufficient funds exception"""
     pass
 
+class EthCallCacheMiddleware(Web3Middleware):
+    """
+    Reuse eth_call results according to deploy_config.BLOCK_TAG_POLICY.
+
+    Calls are keyed on (endpoint, to, data, block). 'pin' views called at 'latest'
+    are rewritten to the current head block, which is re-read at most every
+    HEAD_TTL seconds and moved forward whenever a transaction receipt is seen,
+    so reads issued after waiting for our own transaction see its block.
+    """
+    CACHE_SIZE = 4096
+    HEAD_TTL = 1.0
+    _cache: Dict[Tuple, Any] = {}   # shared by every Web3 instance in the process
+    _heads: Dict[str, Tuple[float, int]] = {}   # endpoint -> (fetched_at, block number)
+    _policy = None                  # selector hex -> policy
+
+    @classmethod
+    def _selectors(cls) -> Dict[str, str]:
+        if cls._policy is None:
+            import deploy_config
+            cls._policy = {
+                '0x' + deploy_config.SELECTORS[name].hex(): policy
+                for functions in BLOCK_TAG_POLICY.values() for name, policy in functions.items()
+            }
+        return cls._policy
+
+    def _head(self, endpoint, make_request) -> Optional[int]:
+        now = time.monotonic()
+        head = self._heads.get(endpoint)
+        if head and now - head[0] < self.HEAD_TTL:
+            return head[1]
+        response = make_request('eth_blockNumber', [])
+        if 'result' not in response:
+            return None
+        number = int(response['result'], 16)
+        self._heads[endpoint] = (now, number)
+        return number
+
+    def wrap_make_request(self, make_request):
+        def middleware(method, params):
+            endpoint = self._w3.provider.endpoint_uri
+            if method == 'eth_getTransactionReceipt':
+                response = make_request(method, params)
+                receipt = response.get('result')
+                head = self._heads.get(endpoint)
+                if receipt and head and int(receipt['blockNumber'], 16) > head[1]:
+                    self._heads[endpoint] = (head[0], int(receipt['blockNumber'], 16))
+                return response
+            if method != 'eth_call':
+                return make_request(method, params)
+
+            tx = params[0]
+            block = params[1] if len(params) > 1 else 'latest'
+            data = tx.get('data') or tx.get('input') or ''
+            policy = self._selectors().get(data[:10])
+            pinned = isinstance(block, int) or str(block).startswith('0x')
+            if policy is None or (not pinned and policy == 'latest'):
+                return make_request(method, params)
+            if policy == 'pin' and not pinned:
+                head = self._head(endpoint, make_request)
+                if head is None:
+                    return make_request(method, params)
+                block = hex(head)
+                params = [tx, block, *params[2:]]
+
+            key = (endpoint, tx.get('to'), data, None if policy == 'any' else block)
+            response = self._cache.get(key)
+            if response is None:
+                response = make_request(method, params)
+                if 'error' not in response:
+                    if len(self._cache) >= self.CACHE_SIZE:
+                        self._cache.pop(next(iter(self._cache)))   # drop the oldest entry
+                    self._cache[key] = response
+            return response
+        return middleware
+
 class BlockchainService:
     """Blockchain service class"""
     
@@ -73,7 +154,8 @@ class BlockchainService:
     def _init_web3(self) -> Web3:
         """Initialize Web3 connection"""
         try:
-            w3 = Web3(Web3.HTTPProvider(self.network_config['rpc_url']))
+            w3 = Web3(get_provider(self.network_name))
+            w3.middleware_onion.add(EthCallCacheMiddleware, name='eth_call_cache')
             if not w3.is_connected():
                 raise BlockchainError(f"Cannot connect to network: {self.network_config['rpc_url']}")
             
@@ -143,12 +225,16 @@ class BlockchainService:
             raise BlockchainError("No account configured, cannot send transaction")
         
         try:
-            # Build transaction
+            # Build transaction (explicit gas_price forces a legacy transaction)
+            if 'gas_price' in kwargs:
+                fees = {'gasPrice': kwargs['gas_price']}
+            else:
+                fees = compute_fees(self.w3, self.network_name)
             transaction = contract_function(*args).build_transaction({
                 'chainId': self.network_config['chain_id'],
                 'gas': kwargs.get('gas', self.network_config['gas_limit']),
-                'gasPrice': kwargs.get('gas_price', self.network_config['gas_price']),
                 'nonce': self.w3.eth.get_transaction_count(self.account.address),
+                **fees,
             })
             
             # Sign transaction
@@ -158,7 +244,7 @@ class BlockchainService:
             tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
             
             # Wait for transaction confirmation
-            tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            tx_receipt = wait_for_receipt(self.w3, tx_hash, self.network_name)
             
             if tx_receipt.status == 1:
                 logger.info(f"Transaction successful: {tx_hash.hex()}")
@@ -495,7 +581,7 @@ class BlockchainService:
         """Get network information"""
         return {
             'network_name': self.network_name,
-            'network_config': self.network_config,
+            'network_config': dict(self.network_config),
             'chain_id': self.w3.eth.chain_id,
             'latest_block': self.w3.eth.block_number,
             'is_connected': self.w3.is_connected()
@@ -101,6 +101,37 @@ class TestAuthAPI:
         assert 'token' in data
         assert data['role'] == 'inspector'
     
+    def test_login_hash_pool_busy(self, client, test_producer):
+        """Test login returns 503 when password verification times out"""
+        from concurrent.futures import TimeoutError
+        from unittest.mock import patch
+
+        with patch('routes.auth._HASH_POOL.submit') as mock_submit:
+            mock_submit.return_value.result.side_effect = TimeoutError
+            response = client.post('/auth/login', json={
+                'email': 'producer@test.com',
+                'password': 'password123'
+            })
+
+        assert response.status_code == 503
+        mock_submit.return_value.cancel.assert_called_once()
+
+    def test_login_hash_queue_full(self, client, test_producer):
+        """Test login returns 503 without queueing when the hash pool has no free slot"""
+        import threading
+        from unittest.mock import patch
+
+        with patch('routes.auth._hash_slots', threading.BoundedSemaphore(1)) as slots, \
+             patch('routes.auth._HASH_POOL.submit') as mock_submit:
+            slots.acquire()
+            response = client.post('/auth/login', json={
+                'email': 'producer@test.com',
+                'password': 'password123'
+            })
+
+        assert response.status_code == 503
+        mock_submit.assert_not_called()
+
     def test_login_invalid_email(self, client):
         """Test login with non-existent email"""
         response = client.post('/auth/login', json={
@@ -1,4 +1,5 @@
 # tests/test_batch.py
+import time
 import pytest
 from unittest.mock import patch
 
@@ -15,8 +16,14 @@ class TestBatchAPI:
         # Should return pagination structure
         assert 'batches' in data or isinstance(data, list)
     
-    def test_create_batch_success_producer(self, client, test_producer):
+    def test_create_batch_success_producer(self, app, client, test_producer):
         """Test successful batch creation by producer"""
+        from datetime import date, timedelta
+        from unittest.mock import MagicMock
+        from deploy_config import SELECTORS, reset_nonce
+        from extensions import db
+        from models import Batch
+
         # Get producer token
         login_response = client.post('/auth/login', json={
             'email': 'producer@test.com',
@@ -24,46 +31,20 @@ class TestBatchAPI:
         })
         token = login_response.get_json()['token']
         headers = {'Authorization': f'Bearer {token}'}
-        
-        # Mock blockchain operations more completely
-        with patch('routes.batch.Web3') as mock_web3, \
-             patch('routes.batch.get_network_config') as mock_config, \
-             patch('routes.batch.get_contract_address') as mock_address, \
-             patch('routes.batch.get_contract_abi') as mock_abi:
-            
-            # Mock network config
-            mock_config.return_value = {'rpc_url': 'http://mock'}
-            mock_address.return_value = '0x123'
-            mock_abi.return_value = []
-            
-            # Mock Web3 instance
-            mock_w3_instance = mock_web3.return_value
-            mock_w3_instance.is_connected.return_value = True
-            
-            # Mock account
-            mock_account = mock_w3_instance.eth.account.from_key.return_value
-            mock_account.address = '0x456'
-            
-            # Mock transaction
-            mock_w3_instance.eth.get_transaction_count.return_value = 1
-            mock_w3_instance.to_wei.return_value = 20000000000
-            
-            # Mock contract
-            mock_contract = mock_w3_instance.eth.contract.return_value
-            mock_build_transaction = mock_contract.functions.createBatch.return_value.build_transaction
-            mock_build_transaction.return_value = {'nonce': 1, 'gas': 500000}
-            
-            # Mock signing and sending
-            mock_signed_txn = mock_w3_instance.eth.account.sign_transaction.return_value
-            mock_signed_txn.raw_transaction = b'mock_raw_tx'
-            
-            mock_tx_hash = mock_w3_instance.eth.send_raw_transaction.return_value
-            mock_tx_hash.hex.return_value = 'mock_tx_hash'
-            
-            # Mock receipt
-            mock_receipt = mock_w3_instance.eth.wait_for_transaction_receipt.return_value
-            mock_receipt.status = 1
-            
+        harvest_date = date.today()
+        expiry_date = date.today() + timedelta(days=30)
+
+        # Mock the node: nonce lookup, signing and sending (the receipt is patched below)
+        mock_w3 = MagicMock()
+        mock_w3.eth.account.from_key.return_value.address = '0x456'
+        mock_w3.eth.get_transaction_count.return_value = 7
+        mock_w3.eth.send_raw_transaction.return_value.hex.return_value = '0xabc'
+        reset_nonce('0x456', 'testnet')
+
+        with patch('routes.batch.get_w3', return_value=mock_w3), \
+             patch('routes.batch.get_contract') as mock_contract, \
+             patch('routes.batch.wait_for_receipt', return_value=MagicMock(status=1)):
+            mock_contract.return_value.address = '0x123'
             response = client.post('/batches', 
                 headers=headers,
                 json={
@@ -73,8 +54,8 @@ class TestBatchAPI:
                         'origin': 'Test Farm',
                         'quantity': '100',
                         'unit': 'kg',
-                        'harvestDate': '2025-01-01',
-                        'expiryDate': '2025-12-31'
+                        'harvestDate': harvest_date.isoformat(),
+                        'expiryDate': expiry_date.isoformat()
                     }
                 }
             )
@@ -83,6 +64,23 @@ class TestBatchAPI:
         data = response.get_json()
         assert data['batchNumber'] == 'TEST001'
         assert data['message'] == 'Batch created successfully'
+        assert data['status'] == 'pending'
+        assert data['blockchainTx'] == '0xabc'
+        assert data['owner'] == '0x456'
+
+        # The transaction was built locally: nonce seeded from the node, createBatch calldata
+        transaction = mock_w3.eth.account.sign_transaction.call_args[0][0]
+        assert transaction['nonce'] == 7
+        assert transaction['to'] == '0x123'
+        assert transaction['data'][:4] == SELECTORS['createBatch']
+
+        # The row was stored with the transaction hash
+        batch = db.session.get(Batch, data['batchId'])
+        assert batch.batch_number == 'TEST001'
+        assert batch.owner_id == test_producer['id']
+        assert batch.blockchain_tx == '0xabc'
+        assert batch.harvest_date == harvest_date
+        assert batch.expiry_date == expiry_date
     
     def test_create_batch_access_denied_inspector(self, client, test_inspector):
         """Test that inspector cannot create batches"""
@@ -174,11 +172,20 @@ class TestBatchAPI:
         token = login_response.get_json()['token']
         headers = {'Authorization': f'Bearer {token}'}
         
-        # Mock blockchain failure
-        with patch('routes.batch.Web3') as mock_web3:
-            mock_w3_instance = mock_web3.return_value
-            mock_w3_instance.is_connected.return_value = False  # Connection fails
-            
+        # Mock blockchain failure: the node can't be reached when the transaction is sent
+        from datetime import date, timedelta
+        from unittest.mock import MagicMock
+        from requests.exceptions import ConnectionError
+        from extensions import db
+        from models import Batch
+
+        mock_w3 = MagicMock()
+        mock_w3.eth.send_raw_transaction.side_effect = ConnectionError('node down')
+
+        with patch('routes.batch.get_w3', return_value=mock_w3), \
+             patch('routes.batch.get_contract'), \
+             patch('routes.batch.next_nonce', return_value=1), \
+             patch('routes.batch.reset_nonce') as mock_reset_nonce:
             response = client.post('/batches',
                 headers=headers,
                 json={
@@ -188,8 +195,8 @@ class TestBatchAPI:
                         'origin': 'Test Origin',
                         'quantity': '100',
                         'unit': 'kg',
-                        'harvestDate': '2025-01-01',
-                        'expiryDate': '2025-12-31'
+                        'harvestDate': date.today().isoformat(),
+                        'expiryDate': (date.today() + timedelta(days=30)).isoformat()
                     }
                 }
             )
@@ -198,6 +205,10 @@ class TestBatchAPI:
         assert response.status_code == 500
         data = response.get_json()
         assert 'Failed to create batch' in data['error']
+        assert 'Failed to connect to blockchain network' in data['details']
+        # The reserved nonce was given back and nothing was stored
+        mock_reset_nonce.assert_called_once()
+        assert db.session.query(Batch).filter_by(batch_number='TEST004').count() == 0
     
     def test_get_single_batch_producer(self, client, test_batch, test_producer):
         """Test getting a single batch by ID as producer"""
@@ -314,7 +325,18 @@ class TestBatchAPI:
         if isinstance(data, dict):
             # Might have pagination fields like total, page, etc.
             assert 'batches' in data or 'items' in data
-    
+
+    def test_batch_pagination_bounds(self, app, client):
+        """Test invalid paging parameters are rejected and oversized ones clamped"""
+        response = client.get('/batches?per_page=abc')
+        assert response.status_code == 400
+
+        response = client.get('/batches?page=0&per_page=1000000')
+        assert response.status_code == 200
+        pagination = response.get_json()['pagination']
+        assert pagination['page'] == 1
+        assert pagination['per_page'] == app.config['MAX_PER_PAGE']
+
     def test_batch_auto_batch_number_generation(self, client, test_producer):
         """Test auto-generation of batch number if not provided"""
         login_response = client.post('/auth/login', json={
@@ -324,13 +346,17 @@ class TestBatchAPI:
         token = login_response.get_json()['token']
         headers = {'Authorization': f'Bearer {token}'}
         
-        with patch('routes.batch.Web3') as mock_web3:
-            mock_w3_instance = mock_web3.return_value
-            mock_w3_instance.is_connected.return_value = True
-            mock_w3_instance.eth.get_transaction_count.return_value = 1
-            mock_w3_instance.eth.send_raw_transaction.return_value.hex.return_value = 'mock_tx_hash'
-            mock_w3_instance.eth.wait_for_transaction_receipt.return_value.status = 1
-            
+        from datetime import date, timedelta
+        from unittest.mock import MagicMock
+
+        mock_w3 = MagicMock()
+        mock_w3.eth.account.from_key.return_value.address = '0x456'
+        mock_w3.eth.send_raw_transaction.return_value.hex.return_value = 'mock_tx_hash'
+
+        with patch('routes.batch.get_w3', return_value=mock_w3), \
+             patch('routes.batch.get_contract'), \
+             patch('routes.batch.next_nonce', return_value=1), \
+             patch('routes.batch.wait_for_receipt', return_value=MagicMock(status=1)):
             response = client.post('/batches',
                 headers=headers,
                 json={
@@ -340,18 +366,16 @@ class TestBatchAPI:
                         'origin': 'Test Farm',
                         'quantity': '50',
                         'unit': 'kg',
-                        'harvestDate': '2025-01-01',
-                        'expiryDate': '2025-12-31'
+                        'harvestDate': date.today().isoformat(),
+                        'expiryDate': (date.today() + timedelta(days=30)).isoformat()
                     }
                 }
             )
         
-        if response.status_code == 201:
-            data = response.get_json()
-            # Should have auto-generated batch number
-            assert 'batchNumber' in data
-            assert data['batchNumber'] is not None
-            assert len(data['batchNumber']) > 0
+        assert response.status_code == 201
+        data = response.get_json()
+        # Should have auto-generated batch number
+        assert data['batchNumber'].startswith('BATCH-')
     
     def test_batch_date_validation(self, client, test_producer):
         """Test date validation in batch creation"""
@@ -380,4 +404,152 @@ class TestBatchAPI:
         
         assert response.status_code == 400
         data = response.get_json()
-        assert 'Validation failed' in data['error'] or 'Invalid' in data['message']
\ No newline at end of file
+        assert 'Validation failed' in data['error'] or 'Invalid' in data['message']
+    
+    def test_bulk_insert_batches(self, app, test_producer):
+        """Test inserting several batches in one commit"""
+        from extensions import db
+        from models import Batch
+
+        with app.app_context():
+            count = Batch.bulk_insert([
+                {'metadata': {'batchNumber': 'BULK001', 'productName': 'Apple', 'origin': 'Farm A',
+                              'quantity': '10', 'unit': 'kg', 'harvestDate': '2025-01-05'}},
+                {'metadata': {'productName': 'Pear', 'origin': 'Farm B', 'quantity': '5', 'unit': 'kg'}},
+                {'metadata': {'productName': 'Plum', 'origin': 'Farm C', 'quantity': '7', 'unit': 'kg'}},
+            ], test_producer['id'])
+
+            assert count == 3
+            batches = db.session.query(Batch).order_by(Batch.id).all()
+            assert [b.product_name for b in batches] == ['Apple', 'Pear', 'Plum']
+            assert batches[0].harvest_date.isoformat() == '2025-01-05'
+            assert batches[0].status == 'pending'
+            assert len({b.batch_number for b in batches}) == 3
+
+    def test_create_batch_async_confirm(self, app, client, test_producer):
+        """Test 202 + background receipt confirmation when ASYNC_TX_CONFIRM is on"""
+        from datetime import date, timedelta
+        from unittest.mock import MagicMock
+
+        login_response = client.post('/auth/login', json={
+            'email': 'producer@test.com',
+            'password': 'password123'
+        })
+        token = login_response.get_json()['token']
+        headers = {'Authorization': f'Bearer {token}'}
+
+        mock_w3 = MagicMock()
+        mock_w3.eth.account.from_key.return_value.address = '0x456'
+        mock_w3.eth.get_transaction_count.return_value = 1
+        mock_w3.eth.send_raw_transaction.return_value.hex.return_value = '0xabc'
+
+        app.config['ASYNC_TX_CONFIRM'] = True
+        with patch('routes.batch.get_w3', return_value=mock_w3), \
+             patch('routes.batch.get_contract'), \
+             patch('routes.batch.next_nonce', return_value=1), \
+             patch('routes.batch.wait_for_receipt', return_value=MagicMock(status=1)), \
+             patch('routes.batch._TX_POOL.submit', side_effect=lambda fn, *args: fn(*args)):
+            response = client.post('/batches',
+                headers=headers,
+                json={
+                    'metadata': {
+                        'batchNumber': 'ASYNC001',
+                        'productName': 'Test Apple',
+                        'origin': 'Test Farm',
+                        'quantity': '100',
+                        'unit': 'kg',
+                        'harvestDate': date.today().isoformat(),
+                        'expiryDate': (date.today() + timedelta(days=30)).isoformat()
+                    }
+                }
+            )
+
+        assert response.status_code == 202
+        data = response.get_json()
+        assert data['transactionHash'] == '0xabc'
+
+        # The background task recorded the tx hash once the receipt came back
+        batch = client.get(f"/batches/{data['batchId']}").get_json()
+        assert batch['blockchainTx'] == '0xabc'
+
+    def test_list_batches_latest_inspection_only(self, app, client, test_batch, test_inspector):
+        """Test the batch list carries only each batch's newest inspection"""
+        from models import Inspection
+
+        with app.app_context():
+            Inspection.bulk_insert([{'result': 'failed'}, {'result': 'passed'}],
+                                   test_batch['id'], test_inspector['id'])
+
+        response = client.get('/batches')
+        assert response.status_code == 200
+        batch = response.get_json()['batches'][0]
+        assert batch['result'] == 'passed'
+        assert [i['result'] for i in batch['inspections']] == ['passed']
+        assert batch['inspections'][0]['inspectorId'] == 'inspector@test.com'
+        # insp_date is the DB's UTC now(); inspDate is true epoch seconds
+        assert abs(batch['inspections'][0]['inspDate'] - time.time()) < 60
+
+    def test_update_batch_status(self, client, test_batch, test_producer):
+        """Test status updates: allowed transition, invalid transition, missing batch"""
+        login_response = client.post('/auth/login', json={
+            'email': 'producer@test.com',
+            'password': 'password123'
+        })
+        headers = {'Authorization': f"Bearer {login_response.get_json()['token']}"}
+        url = f"/batches/{test_batch['id']}/status"
+
+        response = client.put(url, json={'status': 'inspected'}, headers=headers)
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['oldStatus'] == 'pending'
+        assert data['newStatus'] == 'inspected'
+        assert client.get(f"/batches/{test_batch['id']}").get_json()['status'] == 'inspected'
+
+        response = client.put(url, json={'status': 'pending'}, headers=headers)
+        assert response.status_code == 400
+
+        response = client.put('/batches/99999/status', json={'status': 'inspected'}, headers=headers)
+        assert response.status_code == 404
+
+    def test_update_batch_status_non_string(self, client, test_batch, test_producer):
+        """Test a non-string status is rejected with 400 rather than failing the update"""
+        login_response = client.post('/auth/login', json={
+            'email': 'producer@test.com',
+            'password': 'password123'
+        })
+        headers = {'Authorization': f"Bearer {login_response.get_json()['token']}"}
+
+        for status in ([], {'name': 'inspected'}, 1):
+            response = client.put(f"/batches/{test_batch['id']}/status", json={'status': status}, headers=headers)
+            assert response.status_code == 400
+            assert 'Invalid status' in response.get_json()['message']
+
+    def test_get_batch_etag(self, client, test_batch):
+        """Test a repeated GET with the batch's ETag is answered with 304"""
+        response = client.get(f"/batches/{test_batch['id']}")
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+
+        response = client.get(f"/batches/{test_batch['id']}", headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+
+    def test_read_error_handler(self, app, client, test_batch):
+        """Test failed reads get their 500 body for database and other errors alike"""
+        from sqlalchemy.exc import OperationalError
+
+        with patch('routes.batch.db.session.get', side_effect=OperationalError('SELECT', {}, Exception('db down'))):
+            response = client.get(f"/batches/{test_batch['id']}")
+        assert response.status_code == 500
+        assert response.get_json()['message'] == 'Failed to retrieve batch'
+
+        # Non-database errors reach the handler as InternalServerError once they aren't propagated
+        app.config['PROPAGATE_EXCEPTIONS'] = False
+        with patch('routes.batch.get_latest_inspections', side_effect=KeyError('inspector')):
+            response = client.get('/batches')
+        assert response.status_code == 500
+        assert response.get_json()['message'].startswith('Failed to retrieve batches')
+
+        # Other endpoints keep their own error handling
+        response = client.put(f"/batches/{test_batch['id']}/status", json={'status': 'inspected'})
+        assert response.status_code == 401